@@ -27,6 +27,8 @@ setup(
     ],
     extras_require={
         "pdf": ["pdf2image>=1.16.0", "PyPDF2>=2.0.0"],
+        "tesserocr": ["tesserocr>=2.5.0"],
+        "pikepdf": ["pikepdf>=5.0.0"],
         "dev": ["pytest>=6.0.0", "black", "flake8"],
     },
 )
\ No newline at end of file
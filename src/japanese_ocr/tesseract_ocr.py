@@ -1,34 +1,68 @@
+import asyncio
+import hashlib
+import json
 import os
+import queue
+import shlex
+import shutil
+import signal
 import tempfile
 import logging
-from typing import Dict, List, Optional, Union, Set, Tuple, Any
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Literal, Optional, Union, Set, Tuple, Any
 from pathlib import Path
 import subprocess
-from dataclasses import dataclass, field, fields
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from collections import defaultdict
+from contextlib import closing, contextmanager
+from dataclasses import asdict, dataclass, field, fields, replace
+from functools import lru_cache
+from itertools import chain, count, islice, repeat
 
 # Optional imports (only needed if installed)
+# Pillow is needed both for PDF support and for the tesserocr backend
+try:
+    from PIL import Image, ImageSequence
+    PIL_SUPPORT = True
+except ImportError:
+    PIL_SUPPORT = False
+
 try:
     import pdf2image
-    PDF_SUPPORT = True
+    PDF_SUPPORT = PIL_SUPPORT
 except ImportError:
     PDF_SUPPORT = False
 
+try:
+    from tesserocr import PyTessBaseAPI
+    TESSEROCR_SUPPORT = PIL_SUPPORT
+except ImportError:
+    TESSEROCR_SUPPORT = False
+
 # Configure logging
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 # Create a logger for this module without modifying global settings
 logger = logging.getLogger("TesseractOCR")
-# Set up handler for this logger only
-handler = logging.StreamHandler()
-handler.setFormatter(logging.Formatter('%(name)s - %(levelname)s - %(message)s'))
-logger.addHandler(handler)
-logger.setLevel(logging.INFO)
-# Prevent propagation to avoid duplicate logs
-logger.propagate = False
+# Set up handler for this logger only, unless it was already configured
+# (e.g. when the module is reloaded)
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # Prevent propagation to avoid duplicate logs
+    logger.propagate = False
 
 
-@dataclass
+@dataclass(frozen=True)
 class TesseractConfig:
-    """Configuration options for Tesseract OCR."""
+    """
+    Configuration options for Tesseract OCR.
+    
+    Configurations are immutable, so they can be hashed and their derived
+    command line arguments cached. Use dataclasses.replace to derive a variant.
+    """
     lang: str = "eng"
     dpi: int = 300
     psm: int = 3
@@ -36,9 +70,21 @@ class TesseractConfig:
     config_string: str = ""
     output_pdf: bool = False
     tessdata_dir: Optional[str] = None
+    # Maximum number of OpenMP threads per Tesseract process. The default of 1
+    # leaves the parallelism to the page and file workers; None keeps the
+    # OMP_THREAD_LIMIT of the environment.
+    omp_thread_limit: Optional[int] = 1
+    # Image format for the rendered pages of PDFs: "auto" (uncompressed PPM),
+    # "png", "jpeg" or "tiff_g4" (bitonal CCITT Group 4 TIFF, smallest for scans)
+    intermediate_format: str = "auto"
+    # Number of times a Tesseract run that failed with a transient error (e.g. a
+    # full disk or a process killed for lack of memory) is retried, and the delay
+    # before the first retry in seconds, doubled for every further retry
+    max_retries: int = 3
+    retry_backoff_s: float = 0.5
     
-    def to_cmd_args(self) -> List[str]:
-        """Convert configuration to command line arguments."""
+    def __post_init__(self):
+        """Build the command line arguments once, as the configuration can't change."""
         args = []
         
         # Language
@@ -50,20 +96,134 @@ class TesseractConfig:
         # OCR engine mode
         args.extend(["--oem", str(self.oem)])
         
-        # Custom config string
-        if self.config_string:
-            for param in self.config_string.split():
-                args.append(param)
-        
-        # Output PDF
-        if self.output_pdf:
-            args.append("pdf")
+        # Custom config string, split like a shell would so that quoted values
+        # (e.g. paths with spaces) stay a single argument
+        config_tokens = tuple(_split_args(self.config_string)) if self.config_string else ()
+        object.__setattr__(self, "_config_tokens", config_tokens)
+        args.extend(config_tokens)
         
         # Tessdata directory
         if self.tessdata_dir:
             args.extend(["--tessdata-dir", self.tessdata_dir])
-            
-        return args
+        
+        # Not a dataclass field, so it is excluded from comparisons, hashing and asdict
+        object.__setattr__(self, "_cmd_args_cache", tuple(args))
+    
+    def to_cmd_args(self) -> List[str]:
+        """
+        Convert configuration to command line arguments.
+        
+        Output formats like pdf are not included, as they depend on the outputs
+        needed by each Tesseract invocation.
+        """
+        return list(self._cmd_args_cache)
+
+
+def _split_args(command_line: str, posix: bool = os.name != "nt") -> List[str]:
+    """
+    Split a command line into arguments like the shell of the platform.
+    
+    On Windows backslashes are kept, so that paths like C:\\tess\\data stay
+    intact. Strings shlex can't parse (e.g. "-c x=it's" with an unmatched
+    quote) are split on whitespace instead.
+    """
+    try:
+        args = shlex.split(command_line, posix=posix)
+    except ValueError:
+        return command_line.split()
+    if not posix:
+        # Non-POSIX mode keeps the quotes around quoted arguments
+        args = [
+            arg[1:-1] if len(arg) > 1 and arg[0] == arg[-1] and arg[0] in "\"'" else arg
+            for arg in args
+        ]
+    return args
+
+
+def _join_args(args: List[str], posix: bool = os.name != "nt") -> str:
+    """Join arguments into a command line that _split_args splits into the same arguments."""
+    if posix:
+        return shlex.join(args)
+    return " ".join(f'"{arg}"' if not arg or any(c.isspace() for c in arg) else arg for arg in args)
+
+
+def _config_key(config: TesseractConfig) -> Tuple:
+    """Key identifying the configurations that can share a Tesseract invocation."""
+    return (
+        config.lang,
+        config.psm,
+        config.oem,
+        config.config_string,
+        config.output_pdf,
+        config.tessdata_dir,
+        config.omp_thread_limit
+    )
+
+
+def _tesseract_env(config: TesseractConfig) -> Optional[Dict[str, str]]:
+    """Environment for a Tesseract process, or None to inherit the current one."""
+    if config.omp_thread_limit is None:
+        return None
+    return {**os.environ, "OMP_THREAD_LIMIT": str(config.omp_thread_limit)}
+
+
+def _ocr_concurrency() -> int:
+    """Number of Tesseract processes to run concurrently for the pages of a PDF."""
+    return max(1, int(os.environ.get("OCR_CONCURRENCY", os.cpu_count() or 1)))
+
+
+def _ext_lower(path: Union[str, Path]) -> str:
+    """Lowercase extension of a file name or path, like Path.suffix without creating a Path."""
+    name = os.path.basename(path)
+    dot = name.rfind(".")
+    return name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+
+
+@lru_cache(maxsize=None)
+def _ram_dirs() -> Tuple[str, ...]:
+    """Writable memory-backed directories for intermediate files."""
+    return tuple(
+        path for path in ("/dev/shm", os.environ.get("XDG_RUNTIME_DIR"))
+        if path and os.path.isdir(path) and os.access(path, os.W_OK)
+    )
+
+
+def _ram_tmp(required_bytes: int = 0) -> str:
+    """
+    Directory for intermediate files, preferring memory-backed locations.
+    
+    Memory-backed filesystems can be small (Docker limits /dev/shm to 64 MB by
+    default), so they are only used if they have room for required_bytes.
+    """
+    for path in _ram_dirs():
+        if shutil.disk_usage(path).free >= required_bytes:
+            return path
+    return tempfile.gettempdir()
+
+
+@dataclass
+class _FileJob:
+    """A file to process with its resolved options."""
+    input_path: Path
+    is_pdf: bool
+    output_dir: Optional[Path]
+    config: TesseractConfig
+    output_base: str
+    # Cache entry for the result, None if caching is disabled or not possible
+    cache_path: Optional[Path] = None
+
+
+@dataclass
+class _PdfJob:
+    """The pages of a PDF to process and the paths of their output files."""
+    page_count: int
+    base_name: str
+    # Directory for the combined output files
+    output_dir: Optional[Path]
+    # Directory for the output files of the individual pages
+    pages_output_dir: Optional[Path]
+    page_filenames: List[str]
+    combine_output: bool
 
 
 class TesseractOCR:
@@ -78,13 +238,69 @@ class TesseractOCR:
     - Flexible configuration options
     """
     
-    SUPPORTED_IMAGE_FORMATS: Set[str] = {".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp", ".gif"}
+    SUPPORTED_IMAGE_FORMATS: FrozenSet[str] = frozenset({".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp", ".gif"})
+    
+    # All formats that can be processed, used by default when scanning directories
+    SUPPORTED_INPUT_FORMATS: FrozenSet[str] = SUPPORTED_IMAGE_FORMATS | {".pdf"}
+    
+    # Versions of the Tesseract executables that were already verified,
+    # keyed by command and modification time of the executable
+    _version_cache: Dict[Tuple[str, float], str] = {}
+    
+    # Image formats that can be batched. TIFF files may contain several pages,
+    # which would break the mapping between batch pages and input files.
+    BATCHABLE_IMAGE_FORMATS: FrozenSet[str] = SUPPORTED_IMAGE_FORMATS - {".tiff", ".tif"}
+    
+    # Maximum number of images passed to a single Tesseract invocation
+    MAX_BATCH_SIZE: int = 100
+    
+    # Minimum number of PDF pages converted to images at a time. Chunks are
+    # enlarged to give every concurrent Tesseract process at least one page.
+    PDF_CHUNK_SIZE: int = 4
+    
+    # Files up to this size are hashed completely to look up cached results.
+    # Larger files are identified by their size and their first and last bytes.
+    CACHE_FULL_HASH_LIMIT: int = 16 * 1024 * 1024
+    CACHE_PARTIAL_HASH_SIZE: int = 64 * 1024
+    
+    # pdftoppm output format for each intermediate page format
+    PAGE_RENDER_FORMATS: Dict[str, str] = {
+        "auto": "ppm",
+        "png": "png",
+        "jpeg": "jpeg",
+        "tiff_g4": "ppm",
+    }
+    
+    # Error messages of Tesseract runs that may succeed when retried
+    TRANSIENT_ERRORS: Tuple[str, ...] = (
+        "No space left",
+        "Cannot allocate memory",
+        "Resource temporarily unavailable",
+        "Cannot open",
+    )
+    
+    # Upper limit for the delay between retries of failed Tesseract runs, in seconds
+    MAX_RETRY_BACKOFF_S: float = 10.0
+    
+    # Command-line flags understood by config_from_string, mapped to the
+    # TesseractConfig field they set and the type of their value
+    CONFIG_FLAGS: Dict[str, Tuple[str, type]] = {
+        "-l": ("lang", str),
+        "--psm": ("psm", int),
+        "--oem": ("oem", int),
+        "--tessdata-dir": ("tessdata_dir", str),
+    }
     
     def __init__(
         self,
         tesseract_cmd: str = "tesseract",
         default_config: Optional[TesseractConfig] = None,
-        default_output_dir: Optional[Union[str, Path]] = None
+        default_output_dir: Optional[Union[str, Path]] = None,
+        backend: str = "cli",
+        cache_dir: Optional[Union[str, Path]] = None,
+        verify: bool = True,
+        preload: bool = False,
+        preload_threshold_mb: int = 10
     ):
         """
         Initialize the TesseractOCR wrapper.
@@ -93,18 +309,92 @@ class TesseractOCR:
             tesseract_cmd: Path to the Tesseract executable
             default_config: Default configuration to use
             default_output_dir: Default directory to save output files
+            backend: "cli" to run the Tesseract executable for every call,
+                     "tesserocr" to run text recognition in-process with a pool of
+                     reused tesserocr APIs (requires tesserocr package), or "auto"
+                     to use tesserocr when it is installed and the executable otherwise
+            cache_dir: Directory for caching extracted text. Files whose content and
+                       configuration were processed before are not OCRed again.
+            verify: Whether to check that the Tesseract executable works
+            preload: Whether to copy PDFs on other filesystems than the system temporary
+                     directory (e.g. network shares) to the temporary directory
+                     before converting them
+            preload_threshold_mb: Minimum size in MB of the PDFs that are preloaded
         """
         self.tesseract_cmd = tesseract_cmd
         self.default_config = default_config or TesseractConfig()
         
+        if backend not in ("cli", "tesserocr", "auto"):
+            raise ValueError(
+                f"Unknown backend: {backend}. Supported backends: 'cli', 'tesserocr', 'auto'"
+            )
+        if backend == "auto":
+            backend = "tesserocr" if TESSEROCR_SUPPORT else "cli"
+        self.backend = backend
+        
         if default_output_dir:
             self.default_output_dir = Path(default_output_dir)
             os.makedirs(self.default_output_dir, exist_ok=True)
         else:
             self.default_output_dir = None
         
+        if cache_dir:
+            self.cache_dir = Path(cache_dir)
+            os.makedirs(self.cache_dir, exist_ok=True)
+        else:
+            self.cache_dir = None
+        
+        self.preload = preload
+        self.preload_threshold_mb = preload_threshold_mb
+        
+        # Output directories that were already created, to avoid a mkdir call per
+        # page. They are forgotten when the next file or set of files is started,
+        # as they may have been deleted in the meantime.
+        self._ensured_dirs: Set[str] = set()
+        self._ensured_dirs_lock = threading.Lock()
+        
         # Verify Tesseract is installed
-        self._verify_tesseract()
+        if verify:
+            self._verify_tesseract()
+        
+        # Set up a pool of in-process APIs, one per concurrent worker. They are
+        # expensive to initialize and therefore reused, and each one is only
+        # re-initialized when it is used with a different language or model.
+        # The configuration applied to each API and the default values of the
+        # variables it set are kept, so they can be reset for the next config.
+        self._apis = None
+        self._api_configs = {}
+        self._api_variable_defaults = {}
+        if backend == "tesserocr":
+            if not TESSEROCR_SUPPORT:
+                raise RuntimeError(
+                    "The tesserocr backend requires the tesserocr package. "
+                    "Install with: pip install tesserocr"
+                )
+            self._apis = queue.Queue()
+            for _ in range(_ocr_concurrency()):
+                self._apis.put(PyTessBaseAPI(init=False))
+            
+            # Initialize one API right away, so that configuration errors show up early
+            api = self._apis.get()
+            try:
+                self._configure_api(api, self.default_config)
+            finally:
+                self._apis.put(api)
+        
+        # Thread pool for the pages of PDFs, shared by all calls and created on first use
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        
+        # pdftoppm processes that may still be started by all PDFs processed at
+        # the same time, so that concurrent PDFs don't multiply the render processes
+        self._free_render_slots = _ocr_concurrency()
+        self._render_slots_changed = threading.Condition()
+        
+        # Limits the Tesseract processes of the async methods. A semaphore belongs
+        # to an event loop, so it is created for the loop that is running.
+        self._async_semaphore = None
+        self._async_semaphore_loop = None
         
         # Check PDF support
         if not PDF_SUPPORT:
@@ -115,6 +405,16 @@ class TesseractOCR:
     
     def _verify_tesseract(self) -> None:
         """Verify that Tesseract is installed and accessible."""
+        # The check spawns a process, so it is only repeated when the executable changes
+        executable = shutil.which(self.tesseract_cmd) or self.tesseract_cmd
+        try:
+            cache_key = (self.tesseract_cmd, os.stat(executable).st_mtime)
+        except OSError:
+            cache_key = None
+        if cache_key in TesseractOCR._version_cache:
+            logger.debug(f"Using Tesseract: {TesseractOCR._version_cache[cache_key]}")
+            return
+        
         try:
             result = subprocess.run(
                 [self.tesseract_cmd, "--version"],
@@ -124,12 +424,101 @@ class TesseractOCR:
             )
             if result.returncode != 0:
                 raise RuntimeError(f"Tesseract check failed: {result.stderr}")
-            logger.info(f"Using Tesseract: {result.stdout.splitlines()[0]}")
+            version = result.stdout.splitlines()[0]
+            logger.info(f"Using Tesseract: {version}")
+            if cache_key is not None:
+                TesseractOCR._version_cache[cache_key] = version
         except FileNotFoundError:
             raise RuntimeError(
                 f"Tesseract executable not found at '{self.tesseract_cmd}'. "
                 "Make sure Tesseract is installed and in your PATH."
             )
+    
+    def _configure_api(self, api: "PyTessBaseAPI", config: TesseractConfig) -> None:
+        """Apply a configuration to a tesserocr API, re-initializing it only when needed."""
+        previous = self._api_configs.get(id(api))
+        if config == previous:
+            return
+        
+        defaults = self._api_variable_defaults.setdefault(id(api), {})
+        init_key = (config.lang, config.oem, config.tessdata_dir)
+        if previous is None or init_key != (previous.lang, previous.oem, previous.tessdata_dir):
+            if config.tessdata_dir:
+                api.Init(path=config.tessdata_dir, lang=config.lang, oem=config.oem)
+            else:
+                api.Init(lang=config.lang, oem=config.oem)
+            # Init resets all variables
+            defaults.clear()
+        else:
+            # Undo the variables of the previous configuration
+            for name, default in defaults.items():
+                api.SetVariable(name, default)
+        
+        api.SetPageSegMode(config.psm)
+        
+        # Apply "-c name=value" variables from the custom config string,
+        # remembering their defaults before they are first changed
+        parts = config._config_tokens
+        for flag, value in zip(parts, parts[1:]):
+            if flag == "-c" and "=" in value:
+                name, val = value.split("=", 1)
+                if name not in defaults:
+                    default = api.GetVariableAsString(name)
+                    if default is not None:
+                        defaults[name] = default
+                api.SetVariable(name, val)
+        
+        self._api_configs[id(api)] = config
+    
+    def close(self) -> None:
+        """Release the resources held by the tesserocr APIs and the page thread pool, if any."""
+        if self._apis is not None:
+            while not self._apis.empty():
+                self._apis.get_nowait().End()
+            self._apis = None
+            self._api_configs.clear()
+            self._api_variable_defaults.clear()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def _ensure_dir(self, directory: Path) -> None:
+        """Create a directory if it wasn't already created for the current file."""
+        key = str(directory)
+        if key in self._ensured_dirs:
+            return
+        with self._ensured_dirs_lock:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(key)
+    
+    def _forget_dirs(self) -> None:
+        """Forget the created directories, so they are checked again when next used."""
+        with self._ensured_dirs_lock:
+            self._ensured_dirs.clear()
+    
+    @contextmanager
+    def _render_slots(self, wanted: int) -> Iterator[int]:
+        """Reserve up to `wanted` pdftoppm processes, waiting until at least one is free."""
+        with self._render_slots_changed:
+            self._render_slots_changed.wait_for(lambda: self._free_render_slots > 0)
+            granted = min(wanted, self._free_render_slots)
+            self._free_render_slots -= granted
+        try:
+            yield granted
+        finally:
+            with self._render_slots_changed:
+                self._free_render_slots += granted
+                self._render_slots_changed.notify_all()
+    
+    def _page_pool(self) -> ThreadPoolExecutor:
+        """Return the thread pool used for PDF pages, creating it if necessary."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=_ocr_concurrency(),
+                    thread_name_prefix="ocr-page"
+                )
+            return self._pool
         
     def process(
         self,
@@ -153,7 +542,7 @@ class TesseractOCR:
             return_text: Whether to return extracted text
             combine_output: For multi-page documents, whether to create a combined output file
             **kwargs: Additional arguments for specific processing methods
-                      (recursive, file_extensions, etc.)
+                      (recursive, file_extensions, max_workers, on_error, etc.)
         
         Returns:
             - For single files: The extracted text (if return_text=True) or None
@@ -162,17 +551,34 @@ class TesseractOCR:
         Raises:
             ValueError: If the input type cannot be determined
         """
-        path = Path(input_path)
+        path = input_path if isinstance(input_path, Path) else Path(input_path)
+        extension = path.suffix.lower()
         
         # Check if input is a file list
-        if path.is_file() and path.suffix.lower() == '.txt':
-            # Check first line to see if it contains file paths
+        if extension == '.txt' and path.is_file():
+            # Check first line to see if it contains file paths. Only the start of
+            # the file is read, and the filesystem is only checked for lines that
+            # look like paths, so that large text files are rejected quickly.
             try:
                 with open(path, 'r') as f:
-                    first_line = f.readline().strip()
-                    if first_line and Path(first_line).exists():
+                    head = f.read(4096)
+                    first_line = head.split("\n", 1)[0].strip()
+                    looks_like_path = len(first_line) < 4096 and (
+                        "/" in first_line
+                        or "\\" in first_line
+                        or first_line.lower().endswith(tuple(self.SUPPORTED_INPUT_FORMATS))
+                    )
+                    if looks_like_path and Path(first_line).exists():
                         logger.info(f"Processing as file list: {path}")
-                        return self.process_file_list(path, output_dir, config, return_text, combine_output)
+                        return self.process_file_list(
+                            path,
+                            output_dir,
+                            config,
+                            return_text,
+                            combine_output,
+                            max_workers=kwargs.get('max_workers'),
+                            on_error=kwargs.get('on_error', 'skip')
+                        )
             except Exception as e:
                 logger.debug(f"Failed to process as file list: {e}")
         
@@ -186,13 +592,14 @@ class TesseractOCR:
                 recursive=kwargs.get('recursive', False),
                 file_extensions=kwargs.get('file_extensions'),
                 return_text=return_text,
-                combine_output=combine_output
+                combine_output=combine_output,
+                max_workers=kwargs.get('max_workers'),
+                on_error=kwargs.get('on_error', 'skip')
             )
         
         # Process as a single file
         if path.is_file():
-            extension = path.suffix.lower()
-            if extension in self.SUPPORTED_IMAGE_FORMATS or extension == '.pdf':
+            if extension in self.SUPPORTED_INPUT_FORMATS:
                 logger.info(f"Processing as single file: {path}")
                 return self.process_file(
                     path, 
@@ -231,40 +638,216 @@ class TesseractOCR:
         Returns:
             The extracted text if return_text is True, otherwise None
         """
-        input_path = Path(input_file)
-        
-        if not input_path.exists():
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-        
-        # Determine output directory
-        out_dir = Path(output_dir) if output_dir else self.default_output_dir
+        job, cached_text = self._start_file(
+            input_file,
+            output_dir,
+            config,
+            output_filename_base,
+            combine_output
+        )
+        if cached_text is not None:
+            return cached_text if return_text else None
         
-        # Use provided config or default
-        cfg = config or self.default_config
+        # The text is always needed when it has to be cached
+        need_text = return_text or job.cache_path is not None
         
         # Handle different file types
-        if input_path.suffix.lower() == ".pdf":
-            return self._process_pdf(
-                input_path, 
-                out_dir, 
-                cfg, 
+        page_text_files = []
+        if job.is_pdf:
+            text = self._process_pdf(
+                job.input_path, 
+                job.output_dir, 
+                job.config, 
                 output_filename_base,
-                return_text,
-                combine_output
+                need_text,
+                combine_output,
+                page_text_files
             )
-        elif input_path.suffix.lower() in self.SUPPORTED_IMAGE_FORMATS:
-            return self._process_image(
-                input_path, 
-                out_dir, 
-                cfg, 
+        else:
+            text = self._process_image(
+                job.input_path, 
+                job.output_dir, 
+                job.config, 
                 output_filename_base,
-                return_text
+                need_text
             )
-        else:
+        
+        self._finish_file(job, text, page_text_files)
+        return text if return_text else None
+    
+    def _start_file(
+        self,
+        input_file: Union[str, Path],
+        output_dir: Optional[Union[str, Path]],
+        config: Optional[TesseractConfig],
+        output_filename_base: Optional[str],
+        combine_output: bool
+    ) -> Tuple[_FileJob, Optional[str]]:
+        """
+        Check a file, resolve its options and look up an earlier result in the cache.
+        
+        Returns:
+            The file to process and its cached text, or None if it isn't cached
+        """
+        input_path = input_file if isinstance(input_file, Path) else Path(input_file)
+        suffix = input_path.suffix.lower()
+        self._forget_dirs()
+        
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        
+        if suffix not in self.SUPPORTED_INPUT_FORMATS:
             raise ValueError(
                 f"Unsupported file format: {input_path.suffix}. "
-                f"Supported formats: {self.SUPPORTED_IMAGE_FORMATS} and .pdf"
+                f"Supported formats: {', '.join(sorted(self.SUPPORTED_INPUT_FORMATS))}"
             )
+        
+        job = _FileJob(
+            input_path=input_path,
+            is_pdf=suffix == ".pdf",
+            # Determine output directory
+            output_dir=Path(output_dir) if output_dir else self.default_output_dir,
+            # Use provided config or default
+            config=config or self.default_config,
+            output_base=output_filename_base or input_path.stem
+        )
+        
+        # Reuse the result of an earlier run on the same content and configuration.
+        # The separate page PDFs of a PDF file are not cached.
+        if not (job.is_pdf and job.config.output_pdf and not combine_output):
+            job.cache_path = self._cache_path(input_path, job.config)
+        cached_text = self._read_cache(
+            job.cache_path,
+            job.config,
+            job.output_dir,
+            job.output_base,
+            is_pdf=job.is_pdf,
+            combine_output=combine_output
+        )
+        if cached_text is not None:
+            logger.info("Using cached result for %s", input_path)
+        return job, cached_text
+    
+    def _finish_file(self, job: _FileJob, text: Optional[str], page_text_files: List[Path]) -> None:
+        """Store the result of a processed file in the cache."""
+        pdf_output = None
+        if job.output_dir and job.config.output_pdf:
+            pdf_output = job.output_dir / f"{job.output_base}.pdf"
+        self._write_cache(job.cache_path, text, pdf_output, page_text_files)
+    
+    def _cache_path(self, input_path: Path, config: TesseractConfig) -> Optional[Path]:
+        """
+        Path of the cached text for a file's content and configuration, if caching is enabled.
+        
+        Large files are identified by their size and the data at their start and end,
+        which avoids reading them completely just to look up the cache.
+        """
+        if self.cache_dir is None:
+            return None
+        
+        file_size = input_path.stat().st_size
+        if file_size <= self.CACHE_FULL_HASH_LIMIT:
+            file_hash = hashlib.blake2b(input_path.read_bytes(), digest_size=16)
+        else:
+            file_hash = hashlib.blake2b(str(file_size).encode('utf-8'), digest_size=16)
+            with open(input_path, 'rb') as f:
+                file_hash.update(f.read(self.CACHE_PARTIAL_HASH_SIZE))
+                f.seek(max(file_size - self.CACHE_PARTIAL_HASH_SIZE, 0))
+                file_hash.update(f.read())
+        
+        # The thread limit and retry settings don't change the result, so they are not part of the key
+        options = asdict(config)
+        for name in ("omp_thread_limit", "max_retries", "retry_backoff_s"):
+            del options[name]
+        config_hash = hashlib.blake2b(
+            json.dumps(options, sort_keys=True).encode('utf-8'), digest_size=8
+        ).hexdigest()
+        return self.cache_dir / f"{file_hash.hexdigest()}_{config_hash}.txt"
+    
+    def _read_cache(
+        self,
+        cache_path: Optional[Path],
+        config: TesseractConfig,
+        output_dir: Optional[Path],
+        output_base: str,
+        is_pdf: bool = False,
+        combine_output: bool = False
+    ) -> Optional[str]:
+        """
+        Return the cached text and restore the cached output files, or None if not cached.
+        
+        The output files are laid out like a run without the cache: PDFs get
+        a text file per page, and only get a document text file and PDF when
+        their output is combined.
+        """
+        if cache_path is None or not cache_path.exists():
+            return None
+        
+        cached_pdf = cache_path.with_suffix(".pdf")
+        cached_pages = cache_path.with_suffix(".pages")
+        if output_dir and config.output_pdf and not cached_pdf.exists():
+            return None
+        # Results of runs without an output directory don't include the page files
+        if output_dir and is_pdf and not cached_pages.is_dir():
+            return None
+        
+        text = cache_path.read_text(encoding='utf-8')
+        if not output_dir:
+            return text
+        
+        if is_pdf:
+            pages_dir = output_dir / "pages" / output_base if combine_output else output_dir
+            self._ensure_dir(pages_dir)
+            for cached_page in cached_pages.iterdir():
+                shutil.copyfile(cached_page, pages_dir / f"{output_base}_page_{cached_page.name}")
+        
+        if combine_output or not is_pdf:
+            self._ensure_dir(output_dir)
+            with open(output_dir / f"{output_base}.txt", 'w', encoding='utf-8') as f:
+                f.write(text)
+            if config.output_pdf:
+                shutil.copyfile(cached_pdf, output_dir / f"{output_base}.pdf")
+        return text
+    
+    def _write_cache(
+        self,
+        cache_path: Optional[Path],
+        text: Optional[str],
+        pdf_output: Optional[Path] = None,
+        page_text_files: Optional[List[Path]] = None
+    ) -> None:
+        """Store a result in the cache, replacing the cache files atomically."""
+        if cache_path is None or text is None:
+            return
+        
+        # Files are written next to the cache and then moved into place. The
+        # temporary directory is removed even if writing fails.
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as tmp_dir:
+            # The pages and the PDF are stored first, as the text file marks a complete cache entry
+            if page_text_files:
+                tmp_pages = os.path.join(tmp_dir, "pages")
+                os.mkdir(tmp_pages)
+                for page_number, page_file in enumerate(page_text_files, 1):
+                    if page_file.exists():
+                        shutil.copyfile(page_file, os.path.join(tmp_pages, f"{page_number}.txt"))
+                cached_pages = cache_path.with_suffix(".pages")
+                # Directories can't replace non-empty ones, so an older copy is removed first
+                shutil.rmtree(cached_pages, ignore_errors=True)
+                try:
+                    os.replace(tmp_pages, cached_pages)
+                except OSError:
+                    # Another worker stored the same pages at the same time
+                    pass
+            
+            if pdf_output is not None and pdf_output.exists():
+                tmp_pdf = os.path.join(tmp_dir, "result.pdf")
+                shutil.copyfile(pdf_output, tmp_pdf)
+                os.replace(tmp_pdf, cache_path.with_suffix(".pdf"))
+            
+            tmp_txt = os.path.join(tmp_dir, "result.txt")
+            with open(tmp_txt, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_txt, cache_path)
     
     def _process_image(
         self,
@@ -280,92 +863,318 @@ class TesseractOCR:
             out_base = output_filename_base
         else:
             out_base = image_path.stem
-            
+        
+        # The in-process backend only produces text, PDF output still requires the executable
+        if self._apis is not None and not config.output_pdf:
+            with Image.open(image_path) as image:
+                return self._process_pil_images(
+                    [image],
+                    output_dir,
+                    config,
+                    [out_base],
+                    return_text
+                )[0]
+        
+        cmd, out_path = self._image_cmd(image_path, output_dir, config, out_base, return_text)
+        
+        logger.info("Running Tesseract on %s", image_path)
+        logger.debug("Command: %s", cmd)
+        
+        # Run Tesseract. Its stdout is only needed when the text is written there.
+        result = self._run_tesseract(
+            cmd,
+            config,
+            stdout=subprocess.PIPE if out_path == "stdout" and return_text else subprocess.DEVNULL
+        )
+        
+        return self._image_text(out_path, result.stdout, return_text)
+    
+    def _image_cmd(
+        self,
+        image_path: Path,
+        output_dir: Optional[Path],
+        config: TesseractConfig,
+        out_base: str,
+        return_text: bool,
+        text_file: bool = False
+    ) -> Tuple[List[str], str]:
+        """
+        Build the Tesseract command for a single image and return it with its output base path.
+        
+        A text file is written to output_dir when the text is returned, when
+        text_file is set or when no other output is requested.
+        """
         # Set up output path
         if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            out_path = output_dir / out_base
+            self._ensure_dir(output_dir)
+            out_path = str(output_dir / out_base)
         else:
-            # Create temporary output if no directory specified
-            tmp_dir = tempfile.mkdtemp()
-            out_path = Path(tmp_dir) / out_base
+            # Nothing needs to be kept on disk, so let Tesseract write the text to stdout
+            out_path = "stdout"
         
         # Build command
-        cmd = [self.tesseract_cmd, str(image_path), str(out_path)]
-        
-        # When return_text is True, we always want txt output regardless of PDF settings
-        output_formats = []
-        if config.output_pdf:
-            output_formats.append("pdf")
-        
-        # Always add txt to cmd when return_text is True
-        # If txt is not specified, tesseract defaults to txt output anyway
-        if return_text and config.output_pdf:
-            output_formats.append("txt")
+        cmd = [self.tesseract_cmd, str(image_path), out_path]
         
         # Add basic config args (lang, psm, oem, etc.)
         cmd.extend(config.to_cmd_args())
         
-        # If we have output_formats, replace "pdf" from to_cmd_args with our full list
-        if output_formats:
-            # Remove "pdf" if it was added by to_cmd_args
-            if "pdf" in cmd:
-                cmd.remove("pdf")
-            # Add all formats
-            cmd.extend(output_formats)
+        # Request all output formats, so that a single pass produces the PDF and the text
+        formats = []
+        if output_dir and config.output_pdf:
+            formats.append("pdf")
+        if return_text or text_file or not formats:
+            formats.append("txt")
+        cmd.extend(formats)
+        return cmd, out_path
+    
+    @staticmethod
+    def _image_text(out_path: str, stdout: Optional[bytes], return_text: bool) -> Optional[str]:
+        """Return the text Tesseract produced for a single image, if requested."""
+        if not return_text:
+            return None
+        if out_path == "stdout":
+            return stdout.decode('utf-8')
+        txt_path = f"{out_path}.txt"
+        if not os.path.exists(txt_path):
+            raise RuntimeError(f"Tesseract did not produce text output: {txt_path}")
+        with open(txt_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def _run_tesseract(
+        self,
+        cmd: List[str],
+        config: TesseractConfig,
+        input_cmd: Optional[List[str]] = None,
+        **kwargs
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a Tesseract command, retrying transient failures with exponential backoff.
+        
+        Args:
+            cmd: The Tesseract command line
+            config: Configuration with the retry and thread settings
+            input_cmd: Command whose output is piped into Tesseract's stdin. It is
+                       run again for every attempt, as its output can't be replayed.
+            **kwargs: Additional arguments for subprocess.run
         
-        logger.info(f"Running Tesseract on {image_path}")
-        logger.debug(f"Command: {' '.join(cmd)}")
+        Raises:
+            RuntimeError: If Tesseract fails with a permanent error or on every attempt
+        """
+        # Limit Tesseract's internal OpenMP threads so that concurrent
+        # invocations don't oversubscribe the available cores
+        env = _tesseract_env(config)
         
-        # Run Tesseract
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+        for attempt in count():
+            if input_cmd is None:
+                result = subprocess.run(cmd, stderr=subprocess.PIPE, env=env, **kwargs)
+            else:
+                producer = subprocess.Popen(input_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                try:
+                    result = subprocess.run(cmd, stdin=producer.stdout, stderr=subprocess.PIPE, env=env, **kwargs)
+                finally:
+                    # Closing the pipe lets the producer exit if Tesseract stopped reading early
+                    producer.stdout.close()
+                    producer.wait()
+                # The producer also fails with a broken pipe when Tesseract fails,
+                # so its result only matters if Tesseract succeeded
+                if result.returncode == 0 and producer.returncode != 0:
+                    raise RuntimeError(f"{input_cmd[0]} failed with exit code {producer.returncode}")
+            
+            if result.returncode == 0:
+                return result
+            delay = self._retry_delay(config, attempt, result.returncode, result.stderr)
+            if delay is None:
+                raise RuntimeError(f"Tesseract failed: {result.stderr.decode('utf-8', 'replace')}")
+            time.sleep(delay)
+    
+    @classmethod
+    def _is_transient(cls, returncode: int, stderr: Optional[bytes]) -> bool:
+        """Whether a failed Tesseract run may succeed when it is retried."""
+        # A negative return code means the process was killed by a signal. Only
+        # SIGKILL, as sent by the OOM killer, is retried: crashes like SIGSEGV or
+        # SIGABRT happen again for the same input. Windows has no SIGKILL.
+        if returncode < 0:
+            return returncode == -getattr(signal, "SIGKILL", 9)
+        message = (stderr or b"").decode('utf-8', 'replace')
+        return any(error in message for error in cls.TRANSIENT_ERRORS)
+    
+    def _retry_delay(
+        self,
+        config: TesseractConfig,
+        attempt: int,
+        returncode: int,
+        stderr: Optional[bytes]
+    ) -> Optional[float]:
+        """
+        Delay in seconds before retrying a failed Tesseract run, or None if it isn't retried.
+        
+        Transient failures are retried up to config.max_retries times, with a
+        delay that doubles for every attempt.
+        """
+        if attempt >= config.max_retries or not self._is_transient(returncode, stderr):
+            return None
+        delay = min(self.MAX_RETRY_BACKOFF_S, config.retry_backoff_s * 2 ** attempt)
+        logger.warning(
+            "Tesseract failed, retrying in %.1fs: %s",
+            delay,
+            (stderr or b"").decode('utf-8', 'replace').strip()
         )
+        return delay
+    
+    def _process_batch(
+        self,
+        image_paths: List[Path],
+        output_dir: Optional[Path],
+        config: TesseractConfig,
+        output_filename_bases: Optional[List[str]] = None,
+        return_text: bool = False,
+        pdf_output: Optional[Path] = None
+    ) -> List[Optional[str]]:
+        """
+        Process several images with a single Tesseract invocation.
         
-        if result.returncode != 0:
-            raise RuntimeError(f"Tesseract failed: {result.stderr}")
+        The image paths are passed to Tesseract as a file list so that the
+        language models are only loaded once. The combined text output is split
+        on the page separator to recover the text of each individual image.
+        With PDF output, Tesseract creates a single PDF containing all images,
+        which is saved to pdf_output.
+        """
+        if config.output_pdf and pdf_output is None:
+            raise ValueError("Batch processing with PDF output requires a pdf_output path")
         
-        # Handle text return
-        text_output = None
-        if return_text:
-            txt_output = Path(f"{out_path}.txt")
-            if txt_output.exists():
-                with open(txt_output, 'r', encoding='utf-8') as f:
-                    text_output = f.read()
-            else:
-                # If file doesn't exist but we need text, run again with txt output only
-                logger.warning(f"Text output not found at {txt_output}, running Tesseract again for text output")
-                txt_cmd = [self.tesseract_cmd, str(image_path), str(out_path)]
-                # Only add language flag for simplicity
-                txt_cmd.extend(["-l", config.lang])
-                subprocess.run(txt_cmd, check=True)
-                
-                # Try reading the text file again
-                if txt_output.exists():
-                    with open(txt_output, 'r', encoding='utf-8') as f:
-                        text_output = f.read()
-                else:
-                    logger.error(f"Failed to create text output file: {txt_output}")
+        bases = output_filename_bases or [image_path.stem for image_path in image_paths]
+        
+        if self._apis is not None and not config.output_pdf:
+            return self._process_pil_images(
+                (Image.open(image_path) for image_path in image_paths),
+                output_dir,
+                config,
+                bases,
+                return_text
+            )
+        
+        with tempfile.TemporaryDirectory(dir=_ram_tmp()) as tmp_dir:
+            list_path = Path(tmp_dir) / "images.txt"
+            with open(list_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(str(image_path) for image_path in image_paths))
             
-            # Clean up temporary directory if we created one and don't need to keep files
-            if not output_dir and os.path.exists(os.path.dirname(out_path)):
-                try:
-                    # Clean up temporary txt file if it exists and we only needed it for return_text
-                    if txt_output.exists() and not output_dir:
-                        txt_output.unlink()
-                    
-                    # If the directory still exists (e.g., we're in a temporary directory)
-                    tmp_path = os.path.dirname(out_path)
-                    if os.path.exists(tmp_path) and tmp_path.startswith(tempfile.gettempdir()):
-                        import shutil
-                        shutil.rmtree(tmp_path)
-                except Exception as e:
-                    logger.warning(f"Failed to clean up temporary files: {e}")
-                
-        return text_output
+            texts = self._run_batch(
+                list_path,
+                len(image_paths),
+                Path(tmp_dir),
+                output_dir,
+                config,
+                bases,
+                return_text,
+                pdf_output
+            )
+        
+        if texts is None:
+            # The text could not be mapped to the images, so process them one at a
+            # time. A batch PDF was already written and is not created again.
+            logger.warning("Could not split batch output, processing images individually")
+            text_config = replace(config, output_pdf=False)
+            texts = [
+                self._process_image(image_path, output_dir, text_config, base, return_text)
+                for image_path, base in zip(image_paths, bases)
+            ]
+        return texts
+    
+    def _run_batch(
+        self,
+        list_path: Path,
+        image_count: int,
+        tmp_dir: Path,
+        output_dir: Optional[Path],
+        config: TesseractConfig,
+        output_filename_bases: List[str],
+        return_text: bool,
+        pdf_output: Optional[Path]
+    ) -> Optional[List[Optional[str]]]:
+        """
+        Run Tesseract once on a list of images and split its text output per image.
+        
+        Returns None if the text output doesn't contain one page per image.
+        """
+        out_path = tmp_dir / "batch"
+        
+        cmd = [self.tesseract_cmd, str(list_path), str(out_path)]
+        cmd.extend(config.to_cmd_args())
+        # Make sure the pages are separated by form feeds, even with a custom separator
+        cmd.extend(["-c", "page_separator=\f"])
+        cmd.append("txt")
+        if config.output_pdf:
+            cmd.append("pdf")
+        
+        logger.info("Running Tesseract on a batch of %d images", image_count)
+        logger.debug("Command: %s", cmd)
+        
+        self._run_tesseract(cmd, config, stdout=subprocess.DEVNULL)
+        
+        with open(f"{out_path}.txt", 'r', encoding='utf-8') as f:
+            combined_text = f.read()
+        
+        if config.output_pdf:
+            shutil.move(f"{out_path}.pdf", pdf_output)
+        
+        # Tesseract terminates every page with a form feed, but some versions
+        # only separate the pages, so a final form feed is optional
+        if combined_text.endswith("\f"):
+            combined_text = combined_text[:-1]
+        pages = combined_text.split("\f")
+        if len(pages) != image_count:
+            # Multi-page images yield more pages than listed images
+            logger.debug("Expected text for %d images but Tesseract returned %d pages", image_count, len(pages))
+            return None
+        texts = [page + "\f" for page in pages]
+        
+        # Write the individual text files that one call per image would have produced
+        if output_dir:
+            self._ensure_dir(output_dir)
+            for base, text in zip(output_filename_bases, texts):
+                with open(output_dir / f"{base}.txt", 'w', encoding='utf-8') as f:
+                    f.write(text)
+        
+        if return_text:
+            return texts
+        return [None] * image_count
+    
+    def _process_pil_images(
+        self,
+        images: Iterable["Image.Image"],
+        output_dir: Optional[Path],
+        config: TesseractConfig,
+        output_filename_bases: List[str],
+        return_text: bool = False
+    ) -> List[Optional[str]]:
+        """Recognize text in in-memory images with an API from the tesserocr pool."""
+        texts = []
+        # Wait for an idle API. Every API is used by a single thread at a time.
+        api = self._apis.get()
+        try:
+            self._configure_api(api, config)
+            for image in images:
+                with image:
+                    # SetImage only uses the current frame, so the pages of
+                    # multi-page images such as TIFFs are recognized one by one.
+                    # Terminate each page with a form feed like the Tesseract text renderer.
+                    page_texts = []
+                    for frame in ImageSequence.Iterator(image):
+                        api.SetImage(frame)
+                        page_texts.append(api.GetUTF8Text() + "\f")
+                texts.append("".join(page_texts))
+        finally:
+            self._apis.put(api)
+        
+        if output_dir:
+            self._ensure_dir(output_dir)
+            for base, text in zip(output_filename_bases, texts):
+                with open(output_dir / f"{base}.txt", 'w', encoding='utf-8') as f:
+                    f.write(text)
+        
+        if return_text:
+            return texts
+        return [None] * len(texts)
     
     def _process_pdf(
         self,
@@ -374,24 +1183,82 @@ class TesseractOCR:
         config: TesseractConfig,
         output_filename_base: Optional[str] = None,
         return_text: bool = False,
-        combine_output: bool = False
+        combine_output: bool = False,
+        page_text_files: Optional[List[Path]] = None
     ) -> Optional[str]:
-        """Process a PDF file by first converting it to images."""
+        """
+        Process a PDF file by first converting it to images.
+        
+        If page_text_files is given, the paths of the text files written for
+        the pages are appended to it.
+        """
+        job = self._start_pdf(pdf_path, output_dir, output_filename_base, combine_output, page_text_files)
+        if job is None:
+            return None
+        
+        # A combined text file is assembled from the page files on disk, so the
+        # text of the pages is only kept in memory when it can't be read back
+        need_text = return_text and not (combine_output and output_dir is not None)
+        
+        # A combined PDF is created by Tesseract directly from batches of pages,
+        # which avoids one Tesseract invocation per page
+        pdf_parts = [] if config.output_pdf and combine_output else None
+        
+        # Every page needs its own Tesseract invocation for its PDF anyway, so
+        # the pages are piped from pdftoppm into Tesseract without writing them to disk
+        pipe_pages = pdf_parts is None and config.output_pdf and config.intermediate_format == "auto"
+        
+        texts = []
+        with self._pdf_tmp_dir(pdf_path, config, pipe_pages) as tmp_dir:
+            source_path = self._preload_pdf(pdf_path, tmp_dir)
+            
+            if pipe_pages:
+                texts = list(self._page_pool().map(
+                    self._process_pdf_page,
+                    repeat(source_path),
+                    range(1, job.page_count + 1),
+                    repeat(job.pages_output_dir),
+                    repeat(config),
+                    job.page_filenames,
+                    repeat(need_text)
+                ))
+            else:
+                # The next chunk is rendered while the current one is processed.
+                # Closing the generator stops the rendering thread if processing fails
+                with closing(self._iter_rendered_pages(source_path, job.page_count, tmp_dir, config)) as rendered_chunks:
+                    for first_page, page_paths in rendered_chunks:
+                        texts.extend(self._process_pdf_pages(
+                            page_paths,
+                            first_page,
+                            tmp_dir,
+                            job.pages_output_dir,
+                            config,
+                            job.page_filenames[first_page - 1:first_page - 1 + len(page_paths)],
+                            need_text,
+                            pdf_parts
+                        ))
+            
+            # The PDFs of the page batches are in the temporary directory
+            return self._finish_pdf(job, config, texts, return_text, pdf_parts)
+    
+    def _start_pdf(
+        self,
+        pdf_path: Path,
+        output_dir: Optional[Path],
+        output_filename_base: Optional[str],
+        combine_output: bool,
+        page_text_files: Optional[List[Path]] = None
+    ) -> Optional[_PdfJob]:
+        """Determine the pages of a PDF and their output paths, or return None if it has no pages."""
         if not PDF_SUPPORT:
             raise RuntimeError(
                 "PDF support requires the pdf2image package. "
                 "Install with: pip install pdf2image"
             )
         
-        # Convert PDF to images
-        logger.info(f"Converting PDF to images: {pdf_path}")
-        images = pdf2image.convert_from_path(
-            pdf_path, 
-            dpi=config.dpi
-        )
-        
         # Skip processing if no pages found
-        if not images:
+        page_count = pdf2image.pdfinfo_from_path(str(pdf_path))["Pages"]
+        if not page_count:
             logger.warning(f"No pages found in PDF: {pdf_path}")
             return None
         
@@ -402,91 +1269,619 @@ class TesseractOCR:
         pages_dir = None
         if output_dir and combine_output:
             pages_dir = output_dir / "pages" / base_name
-            os.makedirs(pages_dir, exist_ok=True)
+            self._ensure_dir(pages_dir)
+        
+        page_filenames = [f"{base_name}_page_{i+1}" for i in range(page_count)]
         
-        # Create temporary directory for images
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            image_paths = []
+        # Use the pages directory if specified, otherwise use the main output directory
+        current_output_dir = pages_dir if pages_dir else output_dir
+        if page_text_files is not None and current_output_dir:
+            page_text_files.extend(current_output_dir / f"{page_filename}.txt" for page_filename in page_filenames)
+        
+        return _PdfJob(
+            page_count=page_count,
+            base_name=base_name,
+            output_dir=output_dir,
+            pages_output_dir=current_output_dir,
+            page_filenames=page_filenames,
+            combine_output=combine_output
+        )
+    
+    @contextmanager
+    def _pdf_tmp_dir(self, pdf_path: Path, config: TesseractConfig, pipe_pages: bool) -> Iterator[Path]:
+        """Temporary directory for the rendered pages of a PDF, in memory if there is enough room."""
+        # The chunk being processed, the one waiting in the queue and the one
+        # being rendered are on disk at the same time
+        rendered_pages = 0 if pipe_pages else 3 * self._pdf_chunk_size()
+        tmp_size = self._pdf_tmp_size(pdf_path, config, rendered_pages)
+        with tempfile.TemporaryDirectory(dir=_ram_tmp(tmp_size)) as tmp_dir:
+            yield Path(tmp_dir)
+    
+    def _finish_pdf(
+        self,
+        job: _PdfJob,
+        config: TesseractConfig,
+        texts: List[Optional[str]],
+        return_text: bool,
+        pdf_parts: Optional[List[Path]]
+    ) -> Optional[str]:
+        """Create the combined output files of a processed PDF and return its text if requested."""
+        # Create combined output files if requested and output_dir is provided
+        if job.combine_output and job.output_dir:
+            combined_txt_path = job.output_dir / f"{job.base_name}.txt"
+            self._write_combined_text(job.pages_output_dir, job.page_filenames, combined_txt_path)
             
-            # Save images to temporary directory
-            for i, image in enumerate(images):
-                img_path = Path(tmp_dir) / f"page_{i+1}.png"
-                image.save(str(img_path), "PNG")
-                image_paths.append(img_path)
+            # If PDF output was requested, combine the PDFs of the pages
+            if config.output_pdf and pdf_parts:
+                self._combine_pdfs(job, pdf_parts)
             
-            # Process each image
-            all_text = []
-            output_files = {"pdf": [], "txt": []}
+            if return_text:
+                return combined_txt_path.read_text(encoding='utf-8')
+            return None
+        
+        # Combine text from all pages
+        if return_text:
+            return "\n\n".join(text for text in texts if text)
             
-            for i, img_path in enumerate(image_paths):
-                page_number = i + 1
-                if output_filename_base:
-                    page_filename = f"{output_filename_base}_page_{page_number}"
-                else:
-                    page_filename = f"{pdf_path.stem}_page_{page_number}"
+        return None
+    
+    def _combine_pdfs(self, job: _PdfJob, pdf_parts: List[Path]) -> None:
+        """
+        Merge the PDFs of the pages of a document into its combined PDF and delete them.
+        
+        If no combined PDF can be created, the PDFs are kept in the pages
+        directory instead, so that the PDF output isn't lost.
+        """
+        if self._merge_pdfs(pdf_parts, job.output_dir / f"{job.base_name}.pdf"):
+            for pdf_part in pdf_parts:
+                pdf_part.unlink()
+            return
+        
+        for i, pdf_part in enumerate(pdf_parts, 1):
+            if pdf_part.parent != job.pages_output_dir:
+                shutil.move(pdf_part, job.pages_output_dir / f"{job.base_name}_part_{i}.pdf")
+        logger.warning(f"Kept the PDFs of the pages in: {job.pages_output_dir}")
+    
+    @staticmethod
+    def _write_combined_text(pages_dir: Path, page_filenames: List[str], combined_txt_path: Path) -> None:
+        """Join the text files of the pages of a document into a single text file."""
+        page_txt_files = [pages_dir / f"{page_filename}.txt" for page_filename in page_filenames]
+        page_txt_files = [txt_file for txt_file in page_txt_files if txt_file.exists()]
+        
+        # Copy the page files one after another instead of joining their text in memory
+        with open(combined_txt_path, 'wb') as f:
+            for i, txt_file in enumerate(page_txt_files):
+                if i:
+                    f.write(b"\n\n")
+                with open(txt_file, 'rb') as page_file:
+                    shutil.copyfileobj(page_file, f, 64 * 1024)
+        logger.info(f"Created combined text file: {combined_txt_path}")
+    
+    def _pdf_chunk_size(self) -> int:
+        """Maximum number of PDF pages rendered at a time, enough for every concurrent Tesseract process."""
+        return max(self.PDF_CHUNK_SIZE, _ocr_concurrency())
+    
+    def _pdf_tmp_size(self, pdf_path: Path, config: TesseractConfig, rendered_pages: int) -> int:
+        """
+        Estimate the temporary space in bytes needed to process a PDF.
+        
+        Pages are assumed to be A4 and rendered as uncompressed RGB images. A
+        preloaded copy of the PDF also lives in the temporary directory.
+        """
+        page_size = int(8.27 * config.dpi) * int(11.69 * config.dpi) * 3
+        size = rendered_pages * page_size
+        if self._needs_preload(pdf_path):
+            size += pdf_path.stat().st_size
+        return size
+    
+    def _needs_preload(self, pdf_path: Path) -> bool:
+        """
+        Whether a PDF is large and not on local storage, so it is worth preloading.
+        
+        Local storage is the filesystem of the system temporary directory. The
+        temporary directory actually used may be memory-backed and therefore a
+        different device even for local PDFs.
+        """
+        if not self.preload:
+            return False
+        stat = pdf_path.stat()
+        return (
+            stat.st_size >= self.preload_threshold_mb * 1024 * 1024
+            and stat.st_dev != os.stat(tempfile.gettempdir()).st_dev
+        )
+    
+    def _preload_pdf(self, pdf_path: Path, tmp_dir: Path) -> Path:
+        """
+        Copy a large PDF on another filesystem to the temporary directory.
+        
+        Rendering reads the PDF in many small pieces, which is slow on network
+        storage. A single sequential copy avoids that. Returns the path to use.
+        """
+        if not self._needs_preload(pdf_path):
+            return pdf_path
+        
+        local_path = tmp_dir / "source.pdf"
+        with open(pdf_path, 'rb') as src, open(local_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, length=4 * 1024 * 1024)
+        logger.info(f"Preloaded PDF to local storage: {pdf_path}")
+        return local_path
+    
+    @staticmethod
+    def _merge_pdfs(pdf_files: List[Path], combined_pdf_path: Path) -> bool:
+        """
+        Merge several PDF files into one, in the given order.
+        
+        Returns:
+            Whether the combined PDF was created
+        """
+        # A single file doesn't need to be parsed at all
+        if len(pdf_files) == 1:
+            shutil.copyfile(pdf_files[0], combined_pdf_path)
+            logger.info(f"Created combined PDF file: {combined_pdf_path}")
+            return True
+        
+        try:
+            import importlib.util
+            # Prefer pikepdf, which merges pages in QPDF's C++ code without
+            # parsing them in Python, and fall back to PyPDF2
+            if importlib.util.find_spec("pikepdf"):
+                import pikepdf
                 
-                # Use the pages directory if specified, otherwise use the main output directory
-                current_output_dir = pages_dir if pages_dir else output_dir
+                with pikepdf.Pdf.new() as combined_pdf:
+                    for pdf_file in pdf_files:
+                        with pikepdf.open(pdf_file) as src:
+                            combined_pdf.pages.extend(src.pages)
+                    combined_pdf.save(combined_pdf_path)
                 
-                text = self._process_image(
-                    img_path,
-                    current_output_dir,
-                    config,
-                    page_filename,
-                    return_text or combine_output  # We need the text if combine_output is True
-                )
+                logger.info(f"Created combined PDF file: {combined_pdf_path}")
+                return True
+            elif importlib.util.find_spec("PyPDF2"):
+                import PyPDF2
                 
-                if text:
-                    all_text.append(text)
-                    
-                    # Keep track of output files for combining later
-                    if combine_output and current_output_dir:
-                        # Note the output files that were created
-                        if config.output_pdf:
-                            pdf_file = current_output_dir / f"{page_filename}.pdf"
-                            if pdf_file.exists():
-                                output_files["pdf"].append(pdf_file)
-                        
-                        txt_file = current_output_dir / f"{page_filename}.txt"
-                        if txt_file.exists():
-                            output_files["txt"].append(txt_file)
-            
-            # Create combined output files if requested and output_dir is provided
-            if combine_output and output_dir and all_text:
-                # Create combined text file
-                combined_txt_path = output_dir / f"{base_name}.txt"
-                with open(combined_txt_path, 'w', encoding='utf-8') as f:
-                    f.write("\n\n".join(all_text))
-                logger.info(f"Created combined text file: {combined_txt_path}")
+                merger = PyPDF2.PdfMerger()
+                for pdf_file in pdf_files:
+                    merger.append(str(pdf_file))
                 
-                # If PDF output was requested, try to combine the PDFs
-                if config.output_pdf and output_files["pdf"]:
-                    try:
-                        # Check if PyPDF2 is available
-                        import importlib.util
-                        if importlib.util.find_spec("PyPDF2"):
-                            import PyPDF2
-                            combined_pdf_path = output_dir / f"{base_name}.pdf"
-                            
-                            merger = PyPDF2.PdfMerger()
-                            for pdf_file in output_files["pdf"]:
-                                merger.append(str(pdf_file))
-                            
-                            with open(combined_pdf_path, 'wb') as f:
-                                merger.write(f)
-                                
-                            logger.info(f"Created combined PDF file: {combined_pdf_path}")
-                        else:
-                            logger.warning("PyPDF2 package not found. Cannot create combined PDF.")
-                            logger.warning("Install with: pip install PyPDF2")
-                    except Exception as e:
-                        logger.error(f"Failed to create combined PDF: {e}")
+                with open(combined_pdf_path, 'wb') as f:
+                    merger.write(f)
+                    
+                logger.info(f"Created combined PDF file: {combined_pdf_path}")
+                return True
+            else:
+                logger.warning("pikepdf or PyPDF2 package not found. Cannot create combined PDF.")
+                logger.warning("Install with: pip install pikepdf")
+        except Exception as e:
+            logger.error(f"Failed to create combined PDF: {e}")
+        return False
+    
+    def _iter_rendered_pages(
+        self,
+        pdf_path: Path,
+        page_count: int,
+        tmp_dir: Path,
+        config: TesseractConfig
+    ) -> Iterator[Tuple[int, List[Path]]]:
+        """
+        Render the pages of a PDF in chunks and yield the first page number and page images of each.
+        
+        Only a few rendered pages are kept on disk at any time. Chunks get
+        fewer pages if the render processes shared by all PDFs are busy.
+        
+        A background thread renders the next chunk while the current one is
+        processed, so that rasterization and OCR overlap. At most one chunk is
+        rendered ahead, and the images of a chunk are deleted once it is done.
+        """
+        page_format = config.intermediate_format
+        if page_format not in self.PAGE_RENDER_FORMATS:
+            raise ValueError(
+                f"Unknown intermediate format: {page_format}. "
+                f"Supported formats: {', '.join(self.PAGE_RENDER_FORMATS)}"
+            )
+        
+        chunk_size = self._pdf_chunk_size()
+        chunks = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            # Hand an item to the consumer, unless it stopped taking them
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def render() -> None:
+            try:
+                first_page = 1
+                while first_page <= page_count:
+                    if stop.is_set():
+                        return
+                    # Chunks shrink when other PDFs use most of the render processes,
+                    # which bounds the number of rendered pages across all PDFs
+                    with self._render_slots(chunk_size) as thread_count:
+                        pages = min(chunk_size, max(self.PDF_CHUNK_SIZE, thread_count))
+                        last_page = min(first_page + pages - 1, page_count)
+                        logger.info("Converting pages %d-%d of PDF to images: %s", first_page, last_page, pdf_path)
+                        pages_dir = tmp_dir / f"pages_{first_page:06d}"
+                        os.mkdir(pages_dir)
+                        page_paths = self._render_pdf_pages(
+                            pdf_path, first_page, last_page, pages_dir, config, thread_count
+                        )
+                    if not put((first_page, pages_dir, page_paths)):
+                        return
+                    first_page = last_page + 1
+            except Exception as e:
+                put(e)
+                return
+            # Signal the end of the PDF
+            put(None)
+        
+        producer = threading.Thread(target=render, name="pdf-render", daemon=True)
+        producer.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                first_page, pages_dir, page_paths = chunk
+                yield first_page, page_paths
+                shutil.rmtree(pages_dir, ignore_errors=True)
+        finally:
+            # Stop the producer if processing ended early. It checks the flag
+            # while it waits for room in the queue, so it can't block forever.
+            stop.set()
+            producer.join()
+    
+    def _render_pdf_pages(
+        self,
+        pdf_path: Path,
+        first_page: int,
+        last_page: int,
+        pages_dir: Path,
+        config: TesseractConfig,
+        thread_count: int = 1
+    ) -> List[Path]:
+        """Convert a range of PDF pages to image files in pages_dir, using thread_count pdftoppm processes."""
+        page_format = config.intermediate_format
+        
+        # Let pdftoppm write the pages straight to disk, so the pixels are not
+        # decoded and re-encoded in Python. PPM is uncompressed and cheapest to write.
+        page_paths = [Path(page_path) for page_path in pdf2image.convert_from_path(
+            pdf_path,
+            dpi=config.dpi,
+            first_page=first_page,
+            last_page=last_page,
+            output_folder=pages_dir,
+            fmt=self.PAGE_RENDER_FORMATS[page_format],
+            jpegopt={"quality": 90} if page_format == "jpeg" else None,
+            grayscale=page_format == "tiff_g4",
+            paths_only=True,
+            thread_count=thread_count
+        )]
+        
+        # pdftoppm can't write Group 4 TIFFs, so the grayscale pages are converted
+        if page_format == "tiff_g4":
+            page_paths = list(self._page_pool().map(self._to_group4_tiff, page_paths))
+        return page_paths
+    
+    def _process_pdf_page(
+        self,
+        pdf_path: Path,
+        page_number: int,
+        output_dir: Optional[Path],
+        config: TesseractConfig,
+        out_base: str,
+        return_text: bool = False
+    ) -> Optional[str]:
+        """
+        Render a single PDF page with pdftoppm and pipe the image into Tesseract.
+        
+        Tesseract only reads the first image of a stream from stdin, so
+        pdftoppm is run once per page.
+        """
+        render_cmd = [
+            "pdftoppm",
+            "-r", str(config.dpi),
+            "-f", str(page_number),
+            "-l", str(page_number),
+            "-singlefile",
+            str(pdf_path)
+        ]
+        cmd, out_path = self._image_cmd(Path("-"), output_dir, config, out_base, return_text)
+        
+        logger.info("Running Tesseract on page %d of %s", page_number, pdf_path)
+        logger.debug("Command: %s | %s", render_cmd, cmd)
+        
+        result = self._run_tesseract(
+            cmd,
+            config,
+            input_cmd=render_cmd,
+            stdout=subprocess.PIPE if out_path == "stdout" and return_text else subprocess.DEVNULL
+        )
+        
+        return self._image_text(out_path, result.stdout, return_text)
+    
+    def _process_pdf_pages(
+        self,
+        page_paths: List[Path],
+        first_page: int,
+        tmp_dir: Path,
+        output_dir: Optional[Path],
+        config: TesseractConfig,
+        output_filename_bases: List[str],
+        return_text: bool = False,
+        pdf_parts: Optional[List[Path]] = None
+    ) -> List[Optional[str]]:
+        """
+        Process the rendered images of a range of PDF pages.
+        
+        With PDF output, every page gets its own PDF file unless pdf_parts is
+        given. In that case the pages are processed in batches and the paths of
+        the resulting multi-page PDFs are appended to pdf_parts, in page order.
+        """
+        if config.output_pdf and pdf_parts is None:
+            # Tesseract writes a single PDF per invocation, so pages that need
+            # their own PDF file are processed one at a time, several concurrently
+            return list(self._page_pool().map(
+                self._process_image,
+                page_paths,
+                repeat(output_dir),
+                repeat(config),
+                output_filename_bases,
+                repeat(return_text)
+            ))
+        
+        # Split the pages into one batch per concurrent Tesseract invocation,
+        # as the pages are independent and can be processed at the same time
+        concurrency = min(_ocr_concurrency(), len(page_paths))
+        batch_size = -(-len(page_paths) // concurrency)
+        starts = range(0, len(page_paths), batch_size)
+        
+        if config.output_pdf:
+            pdf_outputs = [tmp_dir / f"part_{first_page + i:06d}.pdf" for i in starts]
+            pdf_parts.extend(pdf_outputs)
+        else:
+            pdf_outputs = [None] * len(starts)
+        
+        batch_texts = self._page_pool().map(
+            self._process_batch,
+            [page_paths[i:i + batch_size] for i in starts],
+            repeat(output_dir),
+            repeat(config),
+            [output_filename_bases[i:i + batch_size] for i in starts],
+            repeat(return_text),
+            pdf_outputs
+        )
+        return [text for batch in batch_texts for text in batch]
+    
+    @staticmethod
+    def _to_group4_tiff(image_path: Path) -> Path:
+        """Convert a page image to a bitonal Group 4 TIFF, replacing the original file."""
+        tiff_path = image_path.with_suffix(".tif")
+        with Image.open(image_path) as image:
+            # Threshold instead of dithering, which would add noise to the text
+            bitonal = image.convert("L").point(lambda value: 255 if value >= 128 else 0, mode="1")
+            bitonal.save(tiff_path, "TIFF", compression="group4")
+        image_path.unlink()
+        return tiff_path
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore limiting concurrent Tesseract processes in the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_semaphore_loop is not loop:
+            self._async_semaphore = asyncio.Semaphore(_ocr_concurrency())
+            self._async_semaphore_loop = loop
+        return self._async_semaphore
+    
+    async def aprocess_file(
+        self,
+        input_file: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        config: Optional[TesseractConfig] = None,
+        output_filename_base: Optional[str] = None,
+        return_text: bool = False,
+        combine_output: bool = False
+    ) -> Optional[str]:
+        """
+        Process a single file without blocking the event loop.
+        
+        Takes the same arguments as process_file. Tesseract runs as an asyncio
+        subprocess, and at most OCR_CONCURRENCY processes run at a time across
+        all concurrent calls in the same event loop. Blocking work like hashing
+        files for the cache and rendering PDF pages runs in a worker thread.
             
-            # Combine text from all pages
-            if return_text:
-                return "\n\n".join(all_text)
+        Returns:
+            The extracted text if return_text is True, otherwise None
+        """
+        loop = asyncio.get_running_loop()
+        job, cached_text = await loop.run_in_executor(
+            None,
+            self._start_file,
+            input_file,
+            output_dir,
+            config,
+            output_filename_base,
+            combine_output
+        )
+        if cached_text is not None:
+            return cached_text if return_text else None
+        
+        need_text = return_text or job.cache_path is not None
+        
+        page_text_files = []
+        if job.is_pdf:
+            text = await self.aprocess_pdf(
+                job.input_path,
+                job.output_dir,
+                job.config,
+                output_filename_base,
+                need_text,
+                combine_output,
+                page_text_files
+            )
+        else:
+            text = await self._aprocess_image(
+                job.input_path,
+                job.output_dir,
+                job.config,
+                output_filename_base,
+                need_text
+            )
+        
+        await loop.run_in_executor(None, self._finish_file, job, text, page_text_files)
+        return text if return_text else None
+    
+    async def aprocess_image(
+        self,
+        image_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        config: Optional[TesseractConfig] = None,
+        output_filename_base: Optional[str] = None,
+        return_text: bool = False
+    ) -> Optional[str]:
+        """Process a single image file with a Tesseract subprocess without blocking the event loop."""
+        self._forget_dirs()
+        return await self._aprocess_image(image_path, output_dir, config, output_filename_base, return_text)
+    
+    async def _aprocess_image(
+        self,
+        image_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]],
+        config: Optional[TesseractConfig],
+        output_filename_base: Optional[str],
+        return_text: bool,
+        text_file: bool = False
+    ) -> Optional[str]:
+        """
+        Process an image like aprocess_image, within the call of a file or PDF.
+        
+        With text_file, the text file is written to output_dir even when the
+        text isn't returned.
+        """
+        image_path = Path(image_path)
+        output_dir = Path(output_dir) if output_dir else self.default_output_dir
+        config = config or self.default_config
+        out_base = output_filename_base or image_path.stem
+        loop = asyncio.get_running_loop()
+        
+        # The in-process backend has no async interface, so it runs in a worker thread
+        if self._apis is not None and not config.output_pdf:
+            return await loop.run_in_executor(
+                None,
+                self._process_image,
+                image_path,
+                output_dir,
+                config,
+                out_base,
+                return_text
+            )
+        
+        # Creating the output directory and reading the text file touch the
+        # disk, so they happen in worker threads as well
+        cmd, out_path = await loop.run_in_executor(
+            None, self._image_cmd, image_path, output_dir, config, out_base, return_text, text_file
+        )
+        
+        logger.info("Running Tesseract on %s", image_path)
+        logger.debug("Command: %s", cmd)
+        
+        for attempt in count():
+            async with self._semaphore():
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=subprocess.PIPE if out_path == "stdout" and return_text else subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    env=_tesseract_env(config)
+                )
+                stdout, stderr = await proc.communicate()
             
-        return None
+            if proc.returncode == 0:
+                return await loop.run_in_executor(None, self._image_text, out_path, stdout, return_text)
+            delay = self._retry_delay(config, attempt, proc.returncode, stderr)
+            if delay is None:
+                raise RuntimeError(f"Tesseract failed: {stderr.decode('utf-8', 'replace')}")
+            await asyncio.sleep(delay)
+    
+    async def aprocess_pdf(
+        self,
+        pdf_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        config: Optional[TesseractConfig] = None,
+        output_filename_base: Optional[str] = None,
+        return_text: bool = False,
+        combine_output: bool = False,
+        page_text_files: Optional[List[Path]] = None
+    ) -> Optional[str]:
+        """
+        Process a PDF file without blocking the event loop.
+        
+        The pages are rendered in chunks like with process_file, and the pages
+        of each chunk are processed concurrently with aprocess_image while the
+        next chunk is rendered. If page_text_files is given, the paths of the
+        text files written for the pages are appended to it.
+        """
+        pdf_path = Path(pdf_path)
+        output_dir = Path(output_dir) if output_dir else self.default_output_dir
+        config = config or self.default_config
+        loop = asyncio.get_running_loop()
+        self._forget_dirs()
+        
+        job = await loop.run_in_executor(
+            None, self._start_pdf, pdf_path, output_dir, output_filename_base, combine_output, page_text_files
+        )
+        if job is None:
+            return None
+        
+        # A combined text file is assembled from the page files on disk, so the
+        # text of the pages is only kept in memory when it can't be read back
+        page_text_file = combine_output and output_dir is not None
+        need_text = return_text and not page_text_file
+        
+        # Every page gets its own PDF, which are merged for combined output
+        pdf_parts = None
+        if config.output_pdf and combine_output and job.pages_output_dir:
+            pdf_parts = [job.pages_output_dir / f"{page_filename}.pdf" for page_filename in job.page_filenames]
+        
+        texts = []
+        # Creating and removing the temporary directory touches the disk, so
+        # it is entered and left in worker threads
+        tmp_dirs = self._pdf_tmp_dir(pdf_path, config, pipe_pages=False)
+        tmp_dir = await loop.run_in_executor(None, tmp_dirs.__enter__)
+        try:
+            source_path = await loop.run_in_executor(None, self._preload_pdf, pdf_path, tmp_dir)
+            rendered_chunks = self._iter_rendered_pages(source_path, job.page_count, tmp_dir, config)
+            next_chunk = None
+            try:
+                while True:
+                    # Waiting for a rendered chunk blocks, so it happens in a worker thread
+                    next_chunk = loop.run_in_executor(None, next, rendered_chunks, None)
+                    chunk = await next_chunk
+                    if chunk is None:
+                        break
+                    first_page, page_paths = chunk
+                    texts.extend(await asyncio.gather(*(
+                        self._aprocess_image(
+                            page_path, job.pages_output_dir, config, page_filename, need_text, page_text_file
+                        )
+                        for page_path, page_filename in zip(
+                            page_paths,
+                            job.page_filenames[first_page - 1:first_page - 1 + len(page_paths)]
+                        )
+                    )))
+            finally:
+                # Stop the rendering thread before the temporary directory is removed.
+                # The generator can only be closed once it isn't running.
+                if next_chunk is not None and not next_chunk.done():
+                    await asyncio.wait([next_chunk])
+                await loop.run_in_executor(None, rendered_chunks.close)
+        finally:
+            await loop.run_in_executor(None, tmp_dirs.__exit__, None, None, None)
+        
+        return await loop.run_in_executor(None, self._finish_pdf, job, config, texts, return_text, pdf_parts)
     
     def process_directory(
         self,
@@ -496,7 +1891,9 @@ class TesseractOCR:
         recursive: bool = False,
         file_extensions: Optional[Set[str]] = None,
         return_text: bool = False,
-        combine_output: bool = False
+        combine_output: bool = False,
+        max_workers: Optional[int] = None,
+        on_error: Literal["raise", "skip", "retry"] = "skip"
     ) -> Dict[str, Optional[str]]:
         """
         Process all supported files in a directory.
@@ -509,54 +1906,35 @@ class TesseractOCR:
             file_extensions: Set of file extensions to process
             return_text: Whether to return extracted text
             combine_output: For multi-page documents, whether to create a combined output file
+            max_workers: Number of files to process in parallel (defaults to the CPU count)
+            on_error: How to handle files that fail: "raise" stops processing,
+                      "skip" logs the error, "retry" processes the file once more
+                      before skipping it
             
         Returns:
             Dictionary mapping filenames to extracted text (if return_text is True)
         """
-        input_path = Path(input_dir)
+        input_path = input_dir if isinstance(input_dir, Path) else Path(input_dir)
         
         if not input_path.is_dir():
             raise ValueError(f"Input path is not a directory: {input_path}")
         
         # Determine file extensions to process
-        extensions = file_extensions or self.SUPPORTED_IMAGE_FORMATS.union({".pdf"})
+        extensions = file_extensions or self.SUPPORTED_INPUT_FORMATS
         
-        # Collect files
-        files_to_process = []
+        # Collect files lazily, so that processing starts while the directory is still being scanned
+        extensions = frozenset(extension.lower() for extension in extensions)
+        files_to_process = self._iter_files(input_path, recursive, extensions)
         
-        if recursive:
-            for root, _, files in os.walk(input_path):
-                for file in files:
-                    file_path = Path(root) / file
-                    if file_path.suffix.lower() in extensions:
-                        files_to_process.append(file_path)
-        else:
-            files_to_process = [
-                f for f in input_path.iterdir()
-                if f.is_file() and f.suffix.lower() in extensions
-            ]
-        
-        # Process files
-        results = {}
-        for file_path in files_to_process:
-            try:
-                text = self.process_file(
-                    file_path,
-                    output_dir,
-                    config,
-                    return_text=return_text,
-                    combine_output=combine_output
-                )
-                
-                if return_text:
-                    results[str(file_path)] = text
-                
-                logger.info(f"Processed: {file_path}")
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                results[str(file_path)] = None
-        
-        return results
+        return self._process_files(
+            files_to_process,
+            output_dir,
+            config,
+            return_text,
+            combine_output,
+            max_workers,
+            on_error
+        )
     
     def process_file_list(
         self,
@@ -564,7 +1942,9 @@ class TesseractOCR:
         output_dir: Optional[Union[str, Path]] = None,
         config: Optional[TesseractConfig] = None,
         return_text: bool = False,
-        combine_output: bool = False
+        combine_output: bool = False,
+        max_workers: Optional[int] = None,
+        on_error: Literal["raise", "skip", "retry"] = "skip"
     ) -> Dict[str, Optional[str]]:
         """
         Process files listed in a text file.
@@ -575,15 +1955,154 @@ class TesseractOCR:
             config: Tesseract configuration
             return_text: Whether to return extracted text
             combine_output: For multi-page documents, whether to create a combined output file
+            max_workers: Number of files to process in parallel (defaults to the CPU count)
+            on_error: How to handle files that fail: "raise" stops processing,
+                      "skip" logs the error, "retry" processes the file once more
+                      before skipping it
             
         Returns:
             Dictionary mapping filenames to extracted text (if return_text is True)
         """
+        return self._process_files(
+            self._iter_file_list(file_list_path),
+            output_dir,
+            config,
+            return_text,
+            combine_output,
+            max_workers,
+            on_error
+        )
+    
+    @staticmethod
+    def _iter_files(root: Path, recursive: bool, extensions: FrozenSet[str]) -> Iterator[Path]:
+        """Lazily yield the files in a directory that have one of the given extensions."""
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            # Directory entries cache their type, which saves a stat call per file
+            try:
+                entries = os.scandir(directory)
+            except OSError as e:
+                # Only an unreadable input directory is an error, unreadable
+                # subdirectories are skipped like files that fail to process
+                if directory == str(root):
+                    raise
+                logger.warning("Skipping unreadable directory %s: %s", directory, e)
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_file():
+                        if _ext_lower(entry.name) in extensions:
+                            yield Path(entry.path)
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+    
+    @staticmethod
+    def _iter_file_list(file_list_path: Union[str, Path]) -> Iterator[str]:
+        """Lazily yield the file paths listed in a text file, one per line."""
         with open(file_list_path, 'r', encoding='utf-8') as f:
-            file_paths = [line.strip() for line in f if line.strip()]
+            for line in f:
+                file_path = line.strip()
+                if file_path:
+                    yield file_path
+    
+    def _process_files(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        output_dir: Optional[Union[str, Path]],
+        config: Optional[TesseractConfig],
+        return_text: bool,
+        combine_output: bool,
+        max_workers: Optional[int],
+        on_error: str = "skip"
+    ) -> Dict[str, Optional[str]]:
+        """
+        Process several files concurrently using a thread pool.
         
-        results = {}
-        for file_path in file_paths:
+        Tesseract runs as a separate process, so threads are sufficient to
+        keep all cores busy while avoiding the pickling overhead of a process pool.
+        The file paths are consumed lazily and only a bounded number of tasks
+        is in flight, so processing starts right away even for very long inputs.
+        """
+        if on_error not in ("raise", "skip", "retry"):
+            raise ValueError(f"Invalid on_error value: {on_error}. Use 'raise', 'skip' or 'retry'.")
+        
+        cfg = config or self.default_config
+        workers = max_workers or os.cpu_count() or 1
+        self._forget_dirs()
+        
+        # Images sharing a text-only configuration and format are grouped into
+        # batches, so that each Tesseract invocation handles several images
+        def batch_key(file_path: Union[str, Path]) -> Optional[Tuple]:
+            suffix = _ext_lower(file_path)
+            if cfg.output_pdf or suffix not in self.BATCHABLE_IMAGE_FORMATS:
+                return None
+            return (_config_key(cfg), suffix)
+        
+        # Look ahead far enough to give every worker a full batch. Shorter inputs
+        # are spread evenly over the workers, longer ones use full batches.
+        paths = iter(file_paths)
+        head = list(islice(paths, workers * self.MAX_BATCH_SIZE))
+        image_count = sum(1 for file_path in head if batch_key(file_path) is not None)
+        batch_size = max(1, min(self.MAX_BATCH_SIZE, -(-image_count // workers)))
+        
+        # Position of every file in the input. Batched images are submitted after
+        # the files that follow them, so the results are sorted by it.
+        input_order = {}
+        
+        def tasks():
+            buckets = defaultdict(list)
+            for file_path in chain(head, paths):
+                input_order.setdefault(str(file_path), len(input_order))
+                key = batch_key(file_path)
+                if key is None:
+                    yield self._process_file_safely, (file_path, output_dir, cfg, return_text, combine_output, on_error)
+                    continue
+                
+                bucket = buckets[key]
+                bucket.append(file_path)
+                if len(bucket) == batch_size:
+                    yield self._process_image_files, (bucket, output_dir, cfg, return_text, on_error)
+                    del buckets[key]
+            
+            for bucket in buckets.values():
+                yield self._process_image_files, (bucket, output_dir, cfg, return_text, on_error)
+        
+        task_results = {}
+        running = set()
+        
+        def collect(future) -> None:
+            running.remove(future)
+            task_results.update(future.result())
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for fn, args in tasks():
+                # Bound the number of queued tasks to keep memory use constant
+                if len(running) >= 2 * workers:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                running.add(executor.submit(fn, *args))
+            
+            for future in as_completed(list(running)):
+                collect(future)
+        
+        return {
+            file_path: task_results[file_path]
+            for file_path in sorted(task_results, key=input_order.__getitem__)
+        }
+    
+    def _process_file_safely(
+        self,
+        file_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]],
+        config: TesseractConfig,
+        return_text: bool,
+        combine_output: bool,
+        on_error: str = "skip"
+    ) -> Dict[str, Optional[str]]:
+        """Process a single file, handling errors according to on_error."""
+        for attempt in range(2 if on_error == "retry" else 1):
             try:
                 text = self.process_file(
                     file_path,
@@ -592,15 +2111,70 @@ class TesseractOCR:
                     return_text=return_text,
                     combine_output=combine_output
                 )
-                
-                if return_text:
-                    results[file_path] = text
-                
-                logger.info(f"Processed: {file_path}")
+                break
             except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                results[file_path] = None
+                if on_error == "raise":
+                    raise
+                error = e
+                if attempt == 0 and on_error == "retry":
+                    logger.warning(f"Retrying {file_path} after error: {e}")
+        else:
+            logger.error(f"Error processing {file_path}: {error}")
+            return {str(file_path): None}
         
+        logger.info("Processed: %s", file_path)
+        return {str(file_path): text} if return_text else {}
+    
+    def _process_image_files(
+        self,
+        image_files: List[Union[str, Path]],
+        output_dir: Optional[Union[str, Path]],
+        config: TesseractConfig,
+        return_text: bool,
+        on_error: str = "skip"
+    ) -> Dict[str, Optional[str]]:
+        """Process image files as one batch, falling back to one call per file on failure."""
+        out_dir = Path(output_dir) if output_dir else self.default_output_dir
+        
+        results = {}
+        pending = []
+        texts = []
+        try:
+            # Files with a cached result don't need to be processed again
+            for file_path in image_files:
+                image_path = Path(file_path)
+                cache_path = self._cache_path(image_path, config)
+                cached_text = self._read_cache(cache_path, config, out_dir, image_path.stem)
+                if cached_text is not None:
+                    logger.info("Using cached result for %s", file_path)
+                    if return_text:
+                        results[str(file_path)] = cached_text
+                else:
+                    pending.append((file_path, cache_path))
+            
+            if pending:
+                texts = self._process_batch(
+                    [Path(file_path) for file_path, _ in pending],
+                    out_dir,
+                    config,
+                    return_text=return_text or self.cache_dir is not None
+                )
+        except Exception as e:
+            if on_error == "raise":
+                raise
+            logger.warning(f"Batch processing failed, processing files individually: {e}")
+            results = {}
+            for file_path in image_files:
+                results.update(
+                    self._process_file_safely(file_path, output_dir, config, return_text, False, on_error)
+                )
+            return results
+        
+        for (file_path, cache_path), text in zip(pending, texts):
+            self._write_cache(cache_path, text)
+            logger.info("Processed: %s", file_path)
+            if return_text:
+                results[str(file_path)] = text
         return results
     
     @staticmethod
@@ -615,34 +2189,26 @@ class TesseractOCR:
         Returns:
             TesseractConfig object with parsed options
         """
-        config = TesseractConfig()
-        parts = config_string.split()
-        
-        i = 0
-        while i < len(parts):
-            if parts[i] == "-l" and i + 1 < len(parts):
-                config.lang = parts[i + 1]
-                i += 2
-            elif parts[i] == "--psm" and i + 1 < len(parts):
-                config.psm = int(parts[i + 1])
-                i += 2
-            elif parts[i] == "--oem" and i + 1 < len(parts):
-                config.oem = int(parts[i + 1])
-                i += 2
-            elif parts[i] == "--tessdata-dir" and i + 1 < len(parts):
-                config.tessdata_dir = parts[i + 1]
-                i += 2
-            elif parts[i] == "pdf":
-                config.output_pdf = True
-                i += 1
+        options = {}
+        custom_params = []
+        tokens = iter(_split_args(config_string))
+        
+        for token in tokens:
+            if token in TesseractOCR.CONFIG_FLAGS:
+                name, cast = TesseractOCR.CONFIG_FLAGS[token]
+                value = next(tokens, None)
+                if value is None:
+                    # A trailing flag without value is passed through unchanged
+                    custom_params.append(token)
+                else:
+                    options[name] = cast(value)
+            elif token == "pdf":
+                options["output_pdf"] = True
             else:
                 # Add to custom config string
-                if config.config_string:
-                    config.config_string += " "
-                config.config_string += parts[i]
-                i += 1
-                
-        return config
+                custom_params.append(token)
+        
+        return TesseractConfig(config_string=_join_args(custom_params), **options)
     
     @staticmethod
     def config_from_kwargs(**kwargs) -> TesseractConfig:
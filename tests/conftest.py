@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+STUBS_DIR = Path(__file__).parent / "stubs"
+
+
+@pytest.fixture
+def stub_tools(tmp_path, monkeypatch):
+    """
+    Put stand-ins for tesseract, pdfinfo and pdftoppm first on the PATH.
+    
+    Returns the file to which the stub tesseract logs its arguments.
+    """
+    if os.name == "nt":
+        pytest.skip("The stub executables are shell scripts")
+    
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for tool in ("tesseract", "pdfinfo", "pdftoppm"):
+        executable = bin_dir / tool
+        executable.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{STUBS_DIR / (tool + ".py")}" "$@"\n')
+        executable.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    
+    log_path = tmp_path / "tesseract.log"
+    log_path.touch()
+    monkeypatch.setenv("STUB_TESSERACT_LOG", str(log_path))
+    return log_path
+
+
+def make_image(path: Path, frames: int = 1) -> Path:
+    """Write a small blank image, with several frames for TIFF files."""
+    images = [Image.new("L", (40, 40), 255) for _ in range(frames)]
+    images[0].save(path, save_all=frames > 1, append_images=images[1:])
+    return path
+
+
+def make_pdf(path: Path, pages: int) -> Path:
+    """Write a stub PDF understood by the stub pdfinfo and pdftoppm."""
+    path.write_text(f"PAGES={pages}\n", encoding="utf-8")
+    return path
+
+
+def tesseract_runs(log_path: Path):
+    """Arguments of the stub tesseract runs that processed images."""
+    with open(log_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
@@ -0,0 +1,7 @@
+"""Stand-in for poppler's pdfinfo, reading the page count of a stub PDF."""
+import sys
+
+from stub_pdf import page_count
+
+path = [arg for arg in sys.argv[1:] if not arg.startswith("-")][0]
+print(f"Title:          stub\nPages:          {page_count(path)}\nEncrypted:      no")
@@ -0,0 +1,45 @@
+"""
+Stand-in for poppler's pdftoppm, rendering blank pages of a stub PDF.
+
+Pages are written to <root>-<page>.<ext>, to <root>.<ext> with -singlefile,
+or to stdout without a root.
+"""
+import io
+import sys
+
+from PIL import Image
+
+from stub_pdf import page_count
+
+VALUED_FLAGS = {"-r", "-f", "-l", "-jpegopt", "-scale-to", "-scale-to-x", "-scale-to-y", "-rx", "-ry"}
+FORMATS = {"-png": ("PNG", "png"), "-jpeg": ("JPEG", "jpg"), "-tiff": ("TIFF", "tif")}
+
+flags, positional = {}, []
+args = iter(sys.argv[1:])
+for arg in args:
+    if arg in VALUED_FLAGS:
+        flags[arg] = next(args)
+    elif arg.startswith("-") and arg != "-":
+        flags[arg] = True
+    else:
+        positional.append(arg)
+
+pdf_path = positional[0]
+root = positional[1] if len(positional) > 1 else None
+pages = page_count(pdf_path)
+first = int(flags.get("-f", 1))
+last = first if "-singlefile" in flags else min(int(flags.get("-l", pages)), pages)
+
+mode = "L" if "-gray" in flags else "RGB"
+image_format, ext = next((FORMATS[flag] for flag in FORMATS if flag in flags), ("PPM", "pgm" if mode == "L" else "ppm"))
+
+for page in range(first, last + 1):
+    image = Image.new(mode, (40, 40), 255)
+    if root is None or root == "-":
+        buffer = io.BytesIO()
+        image.save(buffer, image_format)
+        sys.stdout.buffer.write(buffer.getvalue())
+    elif "-singlefile" in flags:
+        image.save(f"{root}.{ext}", image_format)
+    else:
+        image.save(f"{root}-{str(page).zfill(len(str(pages)))}.{ext}", image_format)
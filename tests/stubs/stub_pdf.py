@@ -0,0 +1,6 @@
+"""Stub PDFs are text files containing "PAGES=<count>"."""
+
+
+def page_count(path):
+    with open(path, encoding="utf-8") as f:
+        return int(f.read().split("PAGES=")[1].split()[0])
@@ -0,0 +1,79 @@
+"""
+Stand-in for the tesseract executable used by the tests.
+
+Every input image yields the page text "TEXT <image name>#<frame>". Inputs
+that aren't images are read as file lists. Environment variables:
+
+- STUB_TESSERACT_LOG: File to which the arguments of every run are appended as JSON
+- STUB_TESSERACT_FAIL: Error message to fail with
+- STUB_TESSERACT_SEPARATOR: "between" to only separate pages with form feeds
+  instead of terminating every page with one
+"""
+import io
+import json
+import os
+import sys
+
+from PIL import Image
+
+VALUED_FLAGS = {"-l", "--psm", "--oem", "--tessdata-dir", "-c"}
+
+
+def page_names(data, name):
+    """Names of the pages of an image, or of all images of a file list."""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return [f"{name}#{frame}" for frame in range(getattr(image, "n_frames", 1))]
+    except Exception:
+        names = []
+        for line in data.decode("utf-8").splitlines():
+            if line.strip():
+                with open(line.strip(), "rb") as f:
+                    names.extend(page_names(f.read(), os.path.basename(line.strip())))
+        return names
+
+
+def main(args):
+    if args and args[0] in ("--version", "-v"):
+        print("tesseract 5.3.0 (stub)")
+        return 0
+    if os.environ.get("STUB_TESSERACT_LOG"):
+        with open(os.environ["STUB_TESSERACT_LOG"], "a", encoding="utf-8") as f:
+            f.write(json.dumps(args) + "\n")
+    if os.environ.get("STUB_TESSERACT_FAIL"):
+        sys.stderr.write(os.environ["STUB_TESSERACT_FAIL"])
+        return 1
+    
+    image, out_base = args[0], args[1]
+    formats = []
+    rest = iter(args[2:])
+    for arg in rest:
+        if arg in VALUED_FLAGS:
+            next(rest)
+        else:
+            formats.append(arg)
+    
+    if image in ("-", "stdin"):
+        pages = page_names(sys.stdin.buffer.read(), "stdin")
+    else:
+        with open(image, "rb") as f:
+            pages = page_names(f.read(), os.path.basename(image))
+    if os.environ.get("STUB_TESSERACT_SEPARATOR") == "between":
+        text = "\f".join(f"TEXT {page}\n" for page in pages)
+    else:
+        text = "".join(f"TEXT {page}\n\f" for page in pages)
+    
+    if out_base in ("-", "stdout"):
+        sys.stdout.write(text)
+        return 0
+    if "txt" in formats or not formats:
+        with open(out_base + ".txt", "w", encoding="utf-8") as f:
+            f.write(text)
+    if "pdf" in formats:
+        images = [Image.new("RGB", (10, 10), 255) for _ in pages]
+        images[0].save(out_base + ".pdf", save_all=True, append_images=images[1:])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
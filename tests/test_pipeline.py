@@ -0,0 +1,438 @@
+"""Tests of the processing pipeline, using stand-ins for the Tesseract and Poppler executables."""
+import asyncio
+import importlib.util
+import os
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+
+import pytest
+
+from japanese_ocr import TesseractOCR, TesseractConfig
+from japanese_ocr import tesseract_ocr
+from japanese_ocr.tesseract_ocr import _ext_lower, _join_args, _ram_tmp, _split_args
+
+from .conftest import make_image, make_pdf, tesseract_runs
+
+
+@pytest.fixture
+def ocr(stub_tools, monkeypatch):
+    monkeypatch.setenv("OCR_CONCURRENCY", "2")
+    ocr = TesseractOCR()
+    yield ocr
+    ocr.close()
+
+
+class FakeAPI:
+    """Stand-in for a tesserocr API, recognizing the frame number and the character whitelist."""
+    
+    def __init__(self):
+        self.inits = 0
+        self.variables = {}
+    
+    def Init(self, path=None, lang="eng", oem=3):
+        self.inits += 1
+        self.variables = {"tessedit_char_whitelist": ""}
+    
+    def SetPageSegMode(self, psm):
+        pass
+    
+    def GetVariableAsString(self, name):
+        return self.variables.get(name)
+    
+    def SetVariable(self, name, value):
+        if name not in self.variables:
+            return False
+        self.variables[name] = value
+        return True
+    
+    def SetImage(self, image):
+        self.frame = image.tell()
+    
+    def GetUTF8Text(self):
+        whitelist = self.variables["tessedit_char_whitelist"]
+        return f"FRAME {self.frame}" + (f" {whitelist}" if whitelist else "") + "\n"
+    
+    def End(self):
+        pass
+
+
+@pytest.fixture
+def api_ocr(ocr):
+    """The ocr fixture with a single fake API as its in-process backend, and the API."""
+    api = FakeAPI()
+    ocr._apis = queue.Queue()
+    ocr._apis.put(api)
+    return ocr, api
+
+
+class TestFileProcessing:
+    """Test processing of directories and file lists."""
+    
+    def test_results_follow_input_order(self, ocr, tmp_path):
+        """Test that concurrently processed files are returned in input order."""
+        images = [make_image(tmp_path / f"{name}.png") for name in "dbfaec"]
+        file_list = tmp_path / "files.txt"
+        file_list.write_text("\n".join(str(image) for image in images))
+        
+        results = ocr.process_file_list(file_list, return_text=True, max_workers=3)
+        assert list(results) == [str(image) for image in images]
+        assert results[str(images[0])] == "TEXT d.png#0\n\f"
+    
+    def test_mixed_results_follow_input_order(self, ocr, tmp_path):
+        """Test that PDFs and TIFFs don't overtake the batched images listed before them."""
+        files = [
+            make_image(tmp_path / "a.png"),
+            make_pdf(tmp_path / "b.pdf", 2),
+            make_image(tmp_path / "c.png"),
+            make_image(tmp_path / "d.tif", frames=2),
+            make_image(tmp_path / "e.png"),
+        ]
+        file_list = tmp_path / "files.txt"
+        file_list.write_text("\n".join(str(path) for path in files))
+        
+        results = ocr.process_file_list(file_list, return_text=True, max_workers=2)
+        assert list(results) == [str(path) for path in files]
+    
+    def test_images_are_batched(self, ocr, stub_tools, tmp_path):
+        """Test that images share Tesseract runs and their text is split per image."""
+        for i in range(6):
+            make_image(tmp_path / f"page{i}.png")
+        
+        results = ocr.process_directory(tmp_path, tmp_path / "out", return_text=True, max_workers=2)
+        assert len(tesseract_runs(stub_tools)) == 2
+        assert results == {str(tmp_path / f"page{i}.png"): f"TEXT page{i}.png#0\n\f" for i in range(6)}
+        assert (tmp_path / "out" / "page3.txt").read_text() == "TEXT page3.png#0\n\f"
+    
+    @pytest.mark.parametrize("separator", ["after", "between"])
+    def test_batch_text_is_split_per_image(self, ocr, stub_tools, tmp_path, monkeypatch, separator):
+        """Test that batch output is split whether or not the last page ends with a form feed."""
+        monkeypatch.setenv("STUB_TESSERACT_SEPARATOR", separator)
+        for i in range(3):
+            make_image(tmp_path / f"page{i}.png")
+        
+        results = ocr.process_directory(tmp_path, return_text=True, max_workers=1)
+        assert len(tesseract_runs(stub_tools)) == 1
+        assert results == {str(tmp_path / f"page{i}.png"): f"TEXT page{i}.png#0\n\f" for i in range(3)}
+    
+    def test_on_error(self, ocr, tmp_path, monkeypatch):
+        """Test that failing files are skipped or stop processing depending on on_error."""
+        image = make_image(tmp_path / "page.png")
+        monkeypatch.setenv("STUB_TESSERACT_FAIL", "Failed loading language 'jpn'")
+        
+        assert ocr.process_directory(tmp_path, return_text=True, on_error="skip") == {str(image): None}
+        with pytest.raises(RuntimeError, match="Failed loading language"):
+            ocr.process_directory(tmp_path, return_text=True, on_error="raise")
+    
+    @pytest.mark.parametrize("use_async", [False, True])
+    @pytest.mark.parametrize("error, runs", [
+        ("write error: No space left on device", 3),
+        ("Failed loading language 'xyz'", 1),
+    ])
+    def test_transient_errors_are_retried(self, ocr, stub_tools, tmp_path, monkeypatch, use_async, error, runs):
+        """Test that only runs failing with a transient error are retried, up to max_retries times."""
+        image = make_image(tmp_path / "page.png")
+        monkeypatch.setenv("STUB_TESSERACT_FAIL", error)
+        config = TesseractConfig(max_retries=2, retry_backoff_s=0.001)
+        
+        with pytest.raises(RuntimeError, match=error):
+            if use_async:
+                asyncio.run(ocr.aprocess_file(image, config=config))
+            else:
+                ocr.process_file(image, config=config)
+        assert len(tesseract_runs(stub_tools)) == runs
+    
+    @pytest.mark.parametrize("returncode, stderr, transient", [
+        (1, b"write error: No space left on device", True),
+        (-getattr(signal, "SIGKILL", 9), b"", True),
+        (-signal.SIGSEGV, b"", False),
+        (-signal.SIGABRT, b"", False),
+        (1, b"Failed loading language 'xyz'", False),
+    ])
+    def test_is_transient(self, returncode, stderr, transient):
+        """Test that only failures that may go away are retried."""
+        assert TesseractOCR._is_transient(returncode, stderr) == transient
+    
+    def test_process_detects_file_lists(self, ocr, tmp_path):
+        """Test that text files are only processed as file lists when they list paths."""
+        image = make_image(tmp_path / "page.png")
+        file_list = tmp_path / "files.txt"
+        file_list.write_text(f"{image}\n")
+        assert ocr.process(file_list, return_text=True) == {str(image): "TEXT page.png#0\n\f"}
+        
+        notes = tmp_path / "notes.txt"
+        notes.write_text("Just some text\n")
+        with pytest.raises(ValueError):
+            ocr.process(notes)
+    
+    def test_unreadable_subdirectories_are_skipped(self, ocr, tmp_path, monkeypatch):
+        """Test that directories that can't be listed are skipped instead of stopping processing."""
+        image = make_image(tmp_path / "page.png")
+        (tmp_path / "locked").mkdir()
+        make_image(tmp_path / "locked" / "hidden.png")
+        scandir = os.scandir
+        
+        def locked_scandir(path):
+            if os.path.basename(path) == "locked":
+                raise PermissionError(13, "Permission denied", path)
+            return scandir(path)
+        
+        monkeypatch.setattr(os, "scandir", locked_scandir)
+        assert ocr.process_directory(tmp_path, return_text=True, recursive=True) == {str(image): "TEXT page.png#0\n\f"}
+        monkeypatch.setattr(os, "scandir", lambda path: locked_scandir(os.path.join(path, "locked")))
+        with pytest.raises(PermissionError):
+            ocr.process_directory(tmp_path, return_text=True)
+    
+    def test_deleted_output_dir_is_recreated(self, ocr, tmp_path):
+        """Test that an output directory deleted between calls is created again."""
+        image = make_image(tmp_path / "page.png")
+        pdf = make_pdf(tmp_path / "doc.pdf", 2)
+        out_dir = tmp_path / "out"
+        
+        for _ in range(2):
+            ocr.process_file(image, out_dir)
+            ocr.process_file(pdf, out_dir, combine_output=True)
+            asyncio.run(ocr.aprocess_image(image, out_dir / "async"))
+            assert set(output_files(out_dir)) == {
+                "page.txt", "doc.txt", "pages/doc/doc_page_1.txt", "pages/doc/doc_page_2.txt", "async/page.txt"
+            }
+            shutil.rmtree(out_dir)
+    
+    def test_api_reads_every_tiff_frame(self, api_ocr, tmp_path):
+        """Test that the in-process backend recognizes all pages of multi-page TIFFs."""
+        ocr, _ = api_ocr
+        tiffs = [make_image(tmp_path / f"scan{i}.tif", frames=3) for i in range(2)]
+        file_list = tmp_path / "files.txt"
+        file_list.write_text("\n".join(str(tiff) for tiff in tiffs))
+        
+        expected = "FRAME 0\n\fFRAME 1\n\fFRAME 2\n\f"
+        assert ocr.process_file(tiffs[0], return_text=True) == expected
+        results = ocr.process_file_list(file_list, return_text=True, max_workers=1)
+        assert results == {str(tiff): expected for tiff in tiffs}
+    
+    def test_api_variables_are_reset(self, api_ocr, tmp_path):
+        """Test that variables of an earlier config don't leak into the next one."""
+        ocr, api = api_ocr
+        image = make_image(tmp_path / "page.png")
+        digits = TesseractConfig(config_string="-c tessedit_char_whitelist=0123456789")
+        
+        assert ocr.process_file(image, config=digits, return_text=True) == "FRAME 0 0123456789\n\f"
+        assert ocr.process_file(image, return_text=True) == "FRAME 0\n\f"
+        assert ocr.process_file(image, config=digits, return_text=True) == "FRAME 0 0123456789\n\f"
+        # Only a different language or model needs a re-initialization
+        assert api.inits == 1
+    
+    @pytest.mark.parametrize("name, extension", [
+        ("scan.PNG", ".png"),
+        ("dir.d/scan", ""),
+        (".hidden", ""),
+        ("archive.tar.GZ", ".gz"),
+    ])
+    def test_ext_lower(self, name, extension):
+        """Test that extensions are taken from the file name like Path.suffix."""
+        assert _ext_lower(name) == extension
+
+
+def output_files(directory):
+    """Relative paths and contents of the text files in a directory tree."""
+    return {str(path.relative_to(directory)): path.read_text() for path in directory.rglob("*.txt")}
+
+
+def test_ram_tmp_needs_free_space(tmp_path, monkeypatch):
+    """Test that memory-backed directories are only used when they have enough room."""
+    monkeypatch.setattr(tesseract_ocr, "_ram_dirs", lambda: (str(tmp_path),))
+    free = shutil.disk_usage(tmp_path).free
+    assert _ram_tmp() == str(tmp_path)
+    assert _ram_tmp(2 * free) == tempfile.gettempdir()
+
+
+def test_only_remote_pdfs_are_preloaded(stub_tools, tmp_path, monkeypatch):
+    """Test that PDFs on the filesystem of the system temporary directory are not preloaded."""
+    pdf = make_pdf(tmp_path / "doc.pdf", 1)
+    other_devices = [
+        path for path in ("/dev/shm", "/dev", "/proc")
+        if os.path.isdir(path) and os.stat(path).st_dev != os.stat(tmp_path).st_dev
+    ]
+    if not other_devices:
+        pytest.skip("No directory on another filesystem")
+    ocr = TesseractOCR(preload=True, preload_threshold_mb=0)
+    
+    monkeypatch.setattr(tempfile, "gettempdir", lambda: str(tmp_path))
+    assert not ocr._needs_preload(pdf)
+    monkeypatch.setattr(tempfile, "gettempdir", lambda: other_devices[0])
+    assert ocr._needs_preload(pdf)
+
+
+@pytest.mark.parametrize("posix, config_string, args", [
+    (True, "-c x=it's", ["-c", "x=it's"]),
+    (True, "-c 'a b' --tessdata-dir /tess/data", ["-c", "a b", "--tessdata-dir", "/tess/data"]),
+    (False, "--tessdata-dir C:\\tess\\data", ["--tessdata-dir", "C:\\tess\\data"]),
+    (False, '--tessdata-dir "C:\\Program Files\\tess"', ["--tessdata-dir", "C:\\Program Files\\tess"]),
+])
+def test_split_args(posix, config_string, args):
+    """Test that config strings are split like the shell of the platform and can be joined again."""
+    assert _split_args(config_string, posix) == args
+    assert _split_args(_join_args(args, posix), posix) == args
+
+
+def test_config_string_with_unmatched_quote():
+    """Test that a config string shlex can't parse is split on whitespace."""
+    assert TesseractConfig(config_string="-c x=it's").to_cmd_args()[-2:] == ["-c", "x=it's"]
+    config = TesseractOCR.config_from_string("--psm 6 -c x=it's")
+    assert config.psm == 6
+    assert config.to_cmd_args()[-2:] == ["-c", "x=it's"]
+
+
+class TestPdfProcessing:
+    """Test processing of PDF files."""
+    
+    def test_pages_are_rendered_in_chunks(self, ocr, tmp_path, monkeypatch):
+        """Test that pages are rendered a chunk at a time and their text kept in page order."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 9)
+        ranges = []
+        render = ocr._render_pdf_pages
+        
+        def record(pdf_path, first_page, last_page, *args):
+            ranges.append((first_page, last_page))
+            return render(pdf_path, first_page, last_page, *args)
+        monkeypatch.setattr(ocr, "_render_pdf_pages", record)
+        
+        text = ocr.process_file(pdf, return_text=True)
+        assert ranges == [(1, 4), (5, 8), (9, 9)]
+        assert text.count("TEXT") == 9
+        pages = [page.split("-")[-1] for page in text.split("\n\n")]
+        assert pages == [f"{i}.ppm#0\n\f" for i in range(1, 10)]
+    
+    @pytest.mark.parametrize("intermediate_format, extension", [
+        ("png", ".png"),
+        ("jpeg", ".jpg"),
+        ("tiff_g4", ".tif"),
+    ])
+    def test_intermediate_format(self, ocr, tmp_path, intermediate_format, extension):
+        """Test that pages are rendered in the requested intermediate format."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 2)
+        config = TesseractConfig(intermediate_format=intermediate_format)
+        text = ocr.process_file(pdf, config=config, return_text=True)
+        assert text.count(f"{extension}#0") == 2
+    
+    def test_page_pdfs_are_piped_from_pdftoppm(self, ocr, stub_tools, tmp_path):
+        """Test that separate page PDFs are created from pages piped into Tesseract."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 3)
+        out_dir = tmp_path / "out"
+        text = ocr.process_file(pdf, out_dir, TesseractConfig(output_pdf=True), return_text=True)
+        
+        assert [run[0] for run in tesseract_runs(stub_tools)] == ["-"] * 3
+        assert text == "\n\n".join(["TEXT stdin#0\n\f"] * 3)
+        for page in range(1, 4):
+            assert (out_dir / f"doc_page_{page}.pdf").exists()
+            assert (out_dir / f"doc_page_{page}.txt").read_text() == "TEXT stdin#0\n\f"
+    
+    def test_failed_chunk_stops_rendering(self, ocr, tmp_path, monkeypatch):
+        """Test that a failure while the last chunk is rendered doesn't leave the renderer blocked."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 8)
+        render = ocr._render_pdf_pages
+        
+        def slow_last_chunk(pdf_path, first_page, *args):
+            # Give the first chunk time to fail before the last one is handed over
+            if first_page > 1:
+                time.sleep(0.5)
+            return render(pdf_path, first_page, *args)
+        monkeypatch.setattr(ocr, "_render_pdf_pages", slow_last_chunk)
+        monkeypatch.setenv("STUB_TESSERACT_FAIL", "Failed loading language 'jpn'")
+        
+        errors = []
+        
+        def process():
+            try:
+                ocr.process_file(pdf, return_text=True)
+            except RuntimeError as e:
+                errors.append(e)
+        worker = threading.Thread(target=process, daemon=True)
+        worker.start()
+        worker.join(timeout=30)
+        assert not worker.is_alive(), "Processing is blocked"
+        assert len(errors) == 1
+    
+    def test_concurrent_pdfs_share_render_processes(self, ocr, tmp_path, monkeypatch):
+        """Test that PDFs processed at the same time don't start more pdftoppm processes than allowed."""
+        for i in range(4):
+            make_pdf(tmp_path / f"doc{i}.pdf", 8)
+        active = []
+        peak = []
+        lock = threading.Lock()
+        render = ocr._render_pdf_pages
+        
+        def count_processes(pdf_path, first_page, last_page, pages_dir, config, thread_count):
+            with lock:
+                active.append(thread_count)
+                peak.append(sum(active))
+            time.sleep(0.05)
+            try:
+                return render(pdf_path, first_page, last_page, pages_dir, config, thread_count)
+            finally:
+                with lock:
+                    active.remove(thread_count)
+        monkeypatch.setattr(ocr, "_render_pdf_pages", count_processes)
+        
+        results = ocr.process_directory(tmp_path, return_text=True, max_workers=4)
+        assert all(text.count("TEXT") == 8 for text in results.values())
+        assert max(peak) <= 2
+    
+    @pytest.mark.parametrize("combine_output", [False, True])
+    def test_cached_pdf_restores_page_files(self, stub_tools, tmp_path, combine_output):
+        """Test that a cached PDF result restores the same files as processing the PDF."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 3)
+        ocr = TesseractOCR(cache_dir=tmp_path / "cache")
+        text = ocr.process_file(pdf, tmp_path / "first", return_text=True, combine_output=combine_output)
+        runs = len(tesseract_runs(stub_tools))
+        
+        cached_text = ocr.process_file(pdf, tmp_path / "second", return_text=True, combine_output=combine_output)
+        assert len(tesseract_runs(stub_tools)) == runs
+        assert cached_text == text
+        assert output_files(tmp_path / "second") == output_files(tmp_path / "first")
+    
+    @pytest.mark.parametrize("output_pdf", [False, True])
+    @pytest.mark.parametrize("return_text", [False, True])
+    def test_async_combined_pdf_matches_sync(self, ocr, tmp_path, output_pdf, return_text):
+        """Test that the async path writes the same combined output as the sync path."""
+        pdf = make_pdf(tmp_path / "doc.pdf", 3)
+        config = TesseractConfig(output_pdf=output_pdf)
+        text = ocr.process_file(pdf, tmp_path / "sync", config, return_text=return_text, combine_output=True)
+        async_text = asyncio.run(
+            ocr.aprocess_file(pdf, tmp_path / "async", config, return_text=return_text, combine_output=True)
+        )
+        
+        files = output_files(tmp_path / "async")
+        assert set(files) == set(output_files(tmp_path / "sync"))
+        assert files["doc.txt"].count("\f") == 3
+        if return_text:
+            assert text and async_text == files["doc.txt"]
+        else:
+            assert text is async_text is None
+        assert (tmp_path / "async" / "doc.pdf").exists() == output_pdf
+    
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_failed_merge_keeps_page_pdfs(self, ocr, tmp_path, monkeypatch, use_async):
+        """Test that the page PDFs are kept when no combined PDF can be created."""
+        find_spec = importlib.util.find_spec
+        monkeypatch.setattr(
+            importlib.util,
+            "find_spec",
+            lambda name, *args: None if name in ("pikepdf", "PyPDF2") else find_spec(name, *args)
+        )
+        pdf = make_pdf(tmp_path / "doc.pdf", 9)
+        out_dir = tmp_path / "out"
+        config = TesseractConfig(output_pdf=True)
+        if use_async:
+            asyncio.run(ocr.aprocess_file(pdf, out_dir, config, combine_output=True))
+            pattern = "doc_page_*.pdf"
+        else:
+            ocr.process_file(pdf, out_dir, config, combine_output=True)
+            pattern = "doc_part_*.pdf"
+        
+        assert not (out_dir / "doc.pdf").exists()
+        parts = sorted((out_dir / "pages" / "doc").glob(pattern))
+        assert len(parts) > 1
@@ -1,7 +1,9 @@
 import pytest
+import dataclasses
 from pathlib import Path
 import tempfile
 import os
+import subprocess
 from japanese_ocr import TesseractOCR, TesseractConfig
 
 # Skip tests if Tesseract is not installed
@@ -42,6 +44,14 @@ class TestTesseractConfig:
         assert "jpn+eng" in args
         assert "--psm" in args
         assert "6" in args
+    
+    def test_config_is_immutable(self):
+        """Test that configurations are frozen and hashable."""
+        config = TesseractConfig(lang="jpn")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.lang = "eng"
+        assert hash(config) == hash(TesseractConfig(lang="jpn"))
+        assert config.to_cmd_args() == TesseractConfig(lang="jpn").to_cmd_args()
 
 class TestTesseractOCR:
     """Test TesseractOCR functionality."""
@@ -75,5 +85,31 @@ class TestTesseractOCR:
         assert config.psm == 7
         assert config.oem == 2
         assert config.output_pdf is True
+    
+    def test_cache_skips_processed_files(self, tmp_path, monkeypatch):
+        """Test that cached results are returned without running Tesseract again."""
+        from PIL import Image
+        image_path = tmp_path / "blank.png"
+        Image.new("L", (100, 100), 255).save(image_path)
+        
+        ocr = TesseractOCR(cache_dir=tmp_path / "cache")
+        text = ocr.process_file(image_path, return_text=True)
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("Tesseract should not run for cached files")
+        monkeypatch.setattr(subprocess, "run", fail)
+        
+        assert ocr.process_file(image_path, return_text=True) == text
+        assert ocr.process_directory(tmp_path, return_text=True) == {str(image_path): text}
+    
+    def test_aprocess_file_matches_process_file(self, tmp_path):
+        """Test that the async entrypoint extracts the same text as the sync one."""
+        import asyncio
+        from PIL import Image
+        image_path = tmp_path / "blank.png"
+        Image.new("L", (100, 100), 255).save(image_path)
+        
+        text = self.ocr.process_file(image_path, return_text=True)
+        assert asyncio.run(self.ocr.aprocess_file(image_path, return_text=True)) == text
 
 # Add more tests that require actual images when needed
\ No newline at end of file